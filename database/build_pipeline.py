@@ -0,0 +1,307 @@
+''' // pipelined word database build: split -> POS -> write, all stages running at the same time
+
+    split   (main thread)    corpus words in chunks -> process pool: syllables + matras  -> pos_queue
+    pos     (1 thread)       chunks from pos_queue -> one batched model call per chunk    -> write_queue
+    write   (1 thread)       chunks from write_queue -> every sink (sqlite store, json ...)
+
+    the queues are bounded, so a slow stage holds the ones before it back instead of filling memory;
+    every stage counts its words & busy time, and samples the depth of the queue it reads from
+'''
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from word_to_syllables.parallel_split import init_worker, iter_word_chunks, split_words_with_matras
+from word_to_syllables.splitBanglaSyllables import SplitBanglaSyllables
+from database.corpus_stats import corpus_stats
+from database.word_store import WordStore
+
+DONE = None  # end of stream marker on the queues
+
+
+class PipelineAborted(Exception):
+    """a stage stopped because another one failed"""
+
+
+class StageMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.words = 0
+        self.chunks = 0
+        self.busy = 0.0
+        self.depth_samples = 0
+        self.depth_total = 0
+        self.depth_max = 0
+
+    def record(self, words: int, seconds: float, depth: int | None = None) -> None:
+        self.words += words
+        self.chunks += 1
+        self.busy += seconds
+        if depth is not None:
+            self.depth_samples += 1
+            self.depth_total += depth
+            self.depth_max = max(self.depth_max, depth)
+
+    def report(self, elapsed: float) -> str:
+        depth = f"queue avg {self.depth_total / self.depth_samples:5.1f} max {self.depth_max:3}" if self.depth_samples else "queue   -"
+        return (
+            f"{self.name:<6} {self.words:>9} words  {self.words / elapsed if elapsed else 0:>9,.0f} words/s  "
+            f"busy {self.busy:7.2f}s ({self.busy / elapsed if elapsed else 0:4.0%})  {depth}"
+        )
+
+
+class BuildPipeline:
+    """
+    :param splitter_factory: builds the POS splitter, called inside the POS thread (the model &
+                             the sqlite POS cache then live in the thread that uses them)
+    :param sinks: objects with open(), write(entries), close(), called from the writer thread
+    """
+
+    def __init__(self, splitter_factory, sinks: list, workers: int | None = None, chunk_words: int = 2000, batch_size: int = 64, queue_size: int = 8, syllable_cache_size: int = 4096):
+        self.workers = workers or os.cpu_count() or 1
+        if self.workers < 1:
+            raise ValueError("`workers` must be at least 1.")
+        self.splitter_factory = splitter_factory
+        self.sinks = sinks
+        self.chunk_words = chunk_words
+        self.batch_size = batch_size
+        self.syllable_cache_size = syllable_cache_size
+        self.pos_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.write_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.failed = threading.Event()
+        self.errors: list[BaseException] = []
+        self.metrics = {name: StageMetrics(name) for name in ("split", "pos", "write")}
+        self.chhondos = SplitBanglaSyllables.chhondos
+        self.frequencies: dict[str, int] | None = None
+        self.pos_cache_stats: dict[str, int] | None = None  # of the POS thread's cache, set when it stops
+
+    # ---- queue helpers that give up when another stage failed
+
+    def put(self, q: queue.Queue, item) -> None:
+        while not self.failed.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise PipelineAborted()
+
+    def get(self, q: queue.Queue):
+        while not self.failed.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        raise PipelineAborted()
+
+    def run_stage(self, stage) -> None:
+        try:
+            stage()
+        except PipelineAborted:
+            pass
+        except BaseException as e:
+            self.errors.append(e)
+            self.failed.set()
+
+    # ---- stages
+
+    def split_results(self, words):
+        """chunks of (word, syllables, matras), in the order of `words`"""
+        chunks = iter_word_chunks(words, self.chunk_words)
+        if self.workers == 1:
+            init_worker(self.syllable_cache_size)
+            for chunk in chunks:
+                yield split_words_with_matras(chunk)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=(self.syllable_cache_size,)) as pool:
+            in_flight = deque(pool.submit(split_words_with_matras, chunk) for chunk in islice(chunks, 2 * self.workers))
+            while in_flight:
+                result = in_flight.popleft().result()
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    in_flight.append(pool.submit(split_words_with_matras, chunk))
+                yield result
+
+    def split_stage(self, words) -> None:
+        metrics = self.metrics["split"]
+        results = self.split_results(words)
+        try:
+            while True:
+                start = time.perf_counter()
+                chunk = next(results, None)
+                if chunk is None:
+                    break
+                metrics.record(len(chunk), time.perf_counter() - start)
+                if chunk:
+                    self.put(self.pos_queue, chunk)
+        finally:
+            results.close()  # shuts the pool down, also when a later stage failed
+        self.put(self.pos_queue, DONE)
+
+    def pos_stage(self) -> None:
+        metrics = self.metrics["pos"]
+        splitter = self.splitter_factory()
+        try:
+            while (chunk := self.get(self.pos_queue)) is not DONE:
+                depth = self.pos_queue.qsize()
+                start = time.perf_counter()
+                tags = splitter.get_parts_of_speech_batch([word for word, _, _ in chunk], batch_size=self.batch_size)
+                entries = [
+                    {"word": word, "syllables": syllables, "totalMatra": dict(zip(self.chhondos, matras)), "POS": tag}
+                    for (word, syllables, matras), tag in zip(chunk, tags)
+                ]
+                if self.frequencies is not None:
+                    for entry in entries:
+                        entry["frequency"] = self.frequencies[entry["word"]]
+                metrics.record(len(entries), time.perf_counter() - start, depth)
+                self.put(self.write_queue, entries)
+            self.put(self.write_queue, DONE)
+        finally:
+            if splitter.pos_cache is not None:
+                self.pos_cache_stats = splitter.pos_cache.stats()
+                splitter.pos_cache.close()
+
+    def write_stage(self) -> None:
+        metrics = self.metrics["write"]
+        opened = []
+        completed = False
+        try:
+            for sink in self.sinks:
+                sink.open()
+                opened.append(sink)
+            while (entries := self.get(self.write_queue)) is not DONE:
+                depth = self.write_queue.qsize()
+                start = time.perf_counter()
+                for sink in self.sinks:
+                    sink.write(entries)
+                metrics.record(len(entries), time.perf_counter() - start, depth)
+            completed = True
+        finally:
+            # a sink that failed to open has nothing to close, the ones before it are rolled back
+            for sink in opened:
+                sink.close(completed)
+
+    def run_words(self, words, frequencies: dict[str, int] | None = None) -> dict[str, StageMetrics]:
+        """
+        build from an iterable of (normalized) words, eg the unique words of a corpus;
+        with `frequencies` ({word: count}) every entry gets its "frequency"
+        :raises: the first exception of any stage, after all stages stopped
+        """
+        self.frequencies = frequencies
+        start = time.perf_counter()
+        threads = [
+            threading.Thread(target=self.run_stage, args=(self.pos_stage,), name="pos"),
+            threading.Thread(target=self.run_stage, args=(self.write_stage,), name="write"),
+        ]
+        for thread in threads:
+            thread.start()
+        self.run_stage(lambda: self.split_stage(words))
+        for thread in threads:
+            thread.join()
+        self.elapsed = time.perf_counter() - start
+
+        if self.errors:
+            raise self.errors[0]
+        return self.metrics
+
+    def report(self) -> str:
+        lines = [metrics.report(self.elapsed) for metrics in self.metrics.values()]
+        if self.pos_cache_stats is not None:
+            lines.append(f"POS cache {self.pos_cache_stats}")
+        return "\n".join(lines) + f"\ntotal  {self.elapsed:.2f}s"
+
+    def __repr__(self):
+        return f"<BuildPipeline> {self.workers} workers, {len(self.sinks)} sinks"
+
+
+# ---- sinks of the write stage; close(completed=False) means the build failed & nothing may be kept
+
+class StoreSink:
+    """
+    all chunks into the sqlite word store in one transaction, committed with `meta` at the end;
+    `frequency_updates` ({word: new occurrences}) of words already in the store go in the same transaction;
+    with `with_stats` the corpus statistics of every word in the store are computed just before the
+    commit & saved with it (meta "corpus_stats"), and kept in `stats`
+    """
+
+    def __init__(self, path: str, replace_all: bool = False, meta: dict | None = None, frequency_updates: dict[str, int] | None = None, with_stats: bool = False):
+        self.path = path
+        self.replace_all = replace_all
+        self.meta = meta
+        self.frequency_updates = frequency_updates
+        self.with_stats = with_stats
+        self.stats: dict | None = None
+        self.count = 0
+
+    def open(self) -> None:
+        self.store = WordStore(self.path)  # opened in the writer thread, sqlite connections stay in their thread
+        self.store.begin(self.replace_all)
+
+    def write(self, entries: list[dict]) -> None:
+        self.count += self.store.add_words(entries)
+
+    def close(self, completed: bool) -> None:
+        if completed:
+            if self.frequency_updates:
+                self.store.add_frequencies(self.frequency_updates)
+            meta = dict(self.meta or {})
+            if self.with_stats:
+                # read inside the open transaction: the new words & updated frequencies included
+                self.stats = meta["corpus_stats"] = corpus_stats(self.store.entries())
+            self.store.commit(meta)
+        else:
+            self.store.conn.rollback()
+        self.store.close()
+
+
+class JsonSink:
+    """streams the same {"words": [...]} document json.dump(indent=4) writes, swapped in only if the build completed"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.temp_path = f"{path}.tmp"
+        self.count = 0
+
+    def open(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.file = open(self.temp_path, "w", encoding="utf-8")
+        self.file.write('{\n    "words": [')
+
+    def write(self, entries: list[dict]) -> None:
+        for entry in entries:
+            text = json.dumps(entry, ensure_ascii=False, indent=4).replace("\n", "\n        ")
+            self.file.write(("," if self.count else "") + "\n        " + text)
+            self.count += 1
+
+    def close(self, completed: bool) -> None:
+        self.file.write("\n    ]\n}" if self.count else "]\n}")
+        self.file.close()
+        if completed:
+            os.replace(self.temp_path, self.path)
+        else:
+            os.remove(self.temp_path)
+
+
+class ListSink:
+    """keeps the entries in memory, for exports that need all of them at once"""
+
+    def __init__(self):
+        self.entries: list[dict] = []
+
+    def open(self) -> None:
+        pass
+
+    def write(self, entries: list[dict]) -> None:
+        self.entries.extend(entries)
+
+    def close(self, completed: bool) -> None:
+        pass
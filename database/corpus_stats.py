@@ -0,0 +1,84 @@
+''' // corpus statistics of the word database, computed by the build & saved with it
+
+    {
+        words, tokens,                              -- unique words, occurrences (sum of "frequency")
+        matra_histograms: {chhondo: [words with matra 0, 1, 2, ...]},
+        pos_distribution: {tag: words},             -- "" for untagged words
+        syllable_inventory,                         -- distinct syllables
+        last_syllables: {syllable: words}           -- most common first
+    }
+
+    stored in the sqlite store's meta table (key "corpus_stats") & in words.columns/meta.json;
+    PoemGenerator reads the histograms to reject a pattern no word can fill before generating
+
+    python database/corpus_stats.py     prints the histograms of the built database
+'''
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.word_columns import CHHONDOS
+
+
+def count_values(values: list[str]) -> dict[str, int]:
+    """{value: occurrences}, most common first (ties in value order)"""
+    if not values:
+        return {}
+    unique, counts = np.unique(np.array(values), return_counts=True)
+    order = np.argsort(-counts, kind="stable")
+    return {str(unique[i]): int(counts[i]) for i in order}
+
+
+def corpus_stats(entries) -> dict:
+    """statistics of word entries (the dicts of db/words.json), see module doc"""
+    entries = list(entries)
+    matras = np.array([[entry["totalMatra"][chhondo] for chhondo in CHHONDOS] for entry in entries], dtype=np.int64).reshape(-1, 3)
+    frequency = np.array([entry.get("frequency", 1) for entry in entries], dtype=np.int64)
+    syllables = [syllable for entry in entries for syllable in entry["syllables"]]
+
+    return {
+        "words": len(entries),
+        "tokens": int(frequency.sum()),
+        "matra_histograms": {chhondo: np.bincount(matras[:, index]).tolist() for index, chhondo in enumerate(CHHONDOS)},
+        "pos_distribution": count_values([entry.get("POS") or "" for entry in entries]),
+        "syllable_inventory": int(np.unique(np.array(syllables)).size) if syllables else 0,
+        "last_syllables": count_values([entry["syllables"][-1] for entry in entries if entry["syllables"]]),
+    }
+
+
+def matra_count(stats: dict, chhondo: str, matra: int) -> int:
+    """words with `matra` in `chhondo`"""
+    histogram = stats["matra_histograms"][chhondo]
+    return histogram[matra] if 0 <= matra < len(histogram) else 0
+
+
+def format_histograms(stats: dict) -> str:
+    """the matra / chhondo table, one row per matra from 1 on"""
+    histograms = [stats["matra_histograms"][chhondo] for chhondo in CHHONDOS]
+    rows = ["# matra     s-b     m-b     a-b"]
+    for matra in range(1, max(map(len, histograms))):
+        counts = [histogram[matra] if matra < len(histogram) else 0 for histogram in histograms]
+        rows.append(f"# {matra:<6}:   " + "".join(f"{count:<8}" for count in counts).rstrip())
+    return "\n".join(rows)
+
+
+if __name__ == "__main__":
+    from database.word_columns import WordColumns
+    from database.word_store import WordStore
+
+    columns_dir = os.path.join(os.getcwd(), "database", "db", "words.columns")
+    store_file = os.path.join(os.getcwd(), "database", "db", "words.sqlite")
+    if os.path.exists(os.path.join(columns_dir, "meta.json")):
+        stats = WordColumns(columns_dir).corpus_stats
+    else:
+        stats = WordStore(store_file, read_only=True).corpus_stats
+    if stats is None:
+        sys.exit("no corpus statistics, rebuild the database (python database/create_db.py)")
+
+    print(f"{stats['words']} words, {stats['tokens']} tokens, {stats['syllable_inventory']} distinct syllables\n")
+    print(format_histograms(stats))
+    print(f"\nPOS: {stats['pos_distribution']}")
+    print(f"last syllables: {dict(list(stats['last_syllables'].items())[:20])}")
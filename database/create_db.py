@@ -8,54 +8,167 @@
             মাত্রাবৃত্ত,
             অক্ষরবৃত্ত
         },
-        POS
+        POS,
+        frequency
     }
 '''
 
 # from ..splitting_syllabi.splitBanglaSyllables import SplitBanglaSyllables
-import json
+import hashlib
 import os
 import sys
+import time
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from word_to_syllables.parallel_split import count_corpus_words
 from word_to_syllables.splitBanglaSyllables import SplitBanglaSyllables
+from database.build_pipeline import BuildPipeline, JsonSink, ListSink, StoreSink
+from database.corpus_stats import corpus_stats
+from database.word_columns import write_word_columns
+from database.word_lines import JsonLinesSink
+from database.word_store import WordStore
 
-def create_word_database(read_file="passage.txt", write_file="db/words.json"):
+# bytes hashed per read when checking the watermark
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def watermark_offset(path: str) -> int:
+    """
+    byte offset just after the last whitespace of the file: everything before it are complete
+    words, a word at the very end may still grow if the scrapers append without a separator
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.seek(max(0, size - (1 << 16)))
+        tail = f.read()
+    last_space = max(tail.rfind(sep) for sep in (b" ", b"\n", b"\t", b"\r"))
+    return size - len(tail) + last_space + 1 if last_space >= 0 else size
+
+
+def prefix_hash(path: str, offset: int) -> str:
+    """sha256 of the first `offset` bytes of the file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        remaining = offset
+        while remaining > 0:
+            chunk = f.read(min(HASH_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def ingested_offset(path: str, store: WordStore) -> int:
+    """
+    where the previous build stopped reading `path`, 0 if there was none or the
+    text before its watermark changed (eg the file was sanitised / rewritten)
+    """
+    watermark = store.get_meta("watermark")
+    if not watermark or watermark["offset"] > os.path.getsize(path):
+        return 0
+    return watermark["offset"] if prefix_hash(path, watermark["offset"]) == watermark["sha256"] else 0
+
+
+def build_range(path: str, store: WordStore | None, incremental: bool) -> tuple[int, int]:
+    """
+    (start, end) byte range of `path` a build reads, `end` is saved as the next watermark;
+    a full build reads the whole file, an incremental one continues at the previous watermark &
+    holds back a word at the very end, which the scrapers may still be appending to
+    """
+    start = ingested_offset(path, store) if incremental and store is not None else 0
+    if not start:
+        return 0, os.path.getsize(path)
+    return start, max(watermark_offset(path), start)
+
+
+def create_word_database(read_file="passage.txt", write_file="db/words.json", batch_size=64, pos_cache_file="db/pos_cache.sqlite", workers=None, store_file="db/words.sqlite", columns_dir="db/words.columns", incremental=False, lines_file="db/words.jsonl"):
+    """
+    `lines_file` (JSON Lines, one word per line) is written as the words are produced;
+    `write_file` is the {"words": [...]} export, skipped if None.
+
+    The words of `read_file` are counted first, then each unique word is syllabified & tagged
+    once; its count is stored as "frequency", so `read_file` does not have to be deduplicated.
+
+    With `incremental=True` only the text appended to `read_file` since the last build is read
+    (see the watermark in the sqlite store), only its words that are not in the store yet are
+    syllabified & tagged, the counts of the others are added to their frequency, and the
+    exports are rewritten from the merged store.
+    The corpus statistics (corpus_stats.py) are recomputed from all the words & saved with them.
+    Falls back to a full build if there was no previous build or the old text changed.
+    """
     read_file = os.path.join(os.getcwd(), f'database/{read_file}')
-    write_file = os.path.join(os.getcwd(), f'database/{write_file}')
-
-    splitter = SplitBanglaSyllables()
-    content = ""
-
-    with open(read_file, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    # split into syllables
-    # syllables = []
-    # for sentence in content.split("\n"):
-    #     syllables.append(splitter.split_sentence_into_syllables(sentence))
-    syllables = splitter.split_sentence_into_syllables(content)
-
-    # building word entries
-    word_entries = []
-    for word, sylls in syllables:
-        entry = {
-            "word": word,
-            "syllables": sylls,
-            "totalMatra": {
-                "স্বরবৃত্ত": splitter.get_matra(sylls, "স্বরবৃত্ত"),
-                "মাত্রাবৃত্ত": splitter.get_matra(sylls, "মাত্রাবৃত্ত"),
-                "অক্ষরবৃত্ত": splitter.get_matra(sylls, "অক্ষরবৃত্ত")
-            },
-            "POS": splitter.get_parts_of_speech(word)
-        }
-        word_entries.append(entry)
-
-    # write to JSON
-    with open(write_file, "w", encoding="utf-8") as f:
-        json.dump({"words": word_entries}, f, ensure_ascii=False, indent=4)
-
-    print(f"Word database written to {write_file}")
+    write_file = os.path.join(os.getcwd(), f'database/{write_file}') if write_file else None
+    lines_file = os.path.join(os.getcwd(), f'database/{lines_file}') if lines_file else None
+    pos_cache_file = os.path.join(os.getcwd(), f'database/{pos_cache_file}') if pos_cache_file else None
+    store_file = os.path.join(os.getcwd(), f'database/{store_file}') if store_file else None
+    columns_dir = os.path.join(os.getcwd(), f'database/{columns_dir}') if columns_dir else None
+    if incremental and not store_file:
+        raise ValueError("an incremental build needs the sqlite word store (`store_file`)")
+
+    store = WordStore(store_file) if store_file else None
+
+    # the range is taken before reading & nothing after it is read: text appended during the
+    # build (& on incremental builds a trailing word) is left for the next build, counted once there
+    start, end = build_range(read_file, store, incremental)
+    if incremental:
+        print(f"incremental build from byte {start}" if start else "no usable watermark, full build")
+
+    # one pass counts every word (byte-range shards of the file, one per worker), after it each unique word is processed once
+    count_start = time.perf_counter()
+    counts = count_corpus_words(read_file, workers=workers, start=start, end=end)
+    known = store.known_words(counts) if start else set()
+    new_words = [word for word in counts if word not in known]
+    print(f"count  {counts.total():>9} words, {len(counts)} unique, {len(new_words)} new  {time.perf_counter() - count_start:.2f}s")
+
+    # split (+ matra) in a process pool -> batched POS tagging -> writers, all overlapping (see build_pipeline.py)
+    sinks: list = []
+    if store is not None:
+        watermark = {"offset": end, "sha256": prefix_hash(read_file, end)}
+        frequency_updates = {word: counts[word] for word in known}
+        store_sink = StoreSink(store_file, replace_all=not start, meta={"watermark": watermark}, frequency_updates=frequency_updates, with_stats=True)
+        sinks.append(store_sink)
+    if lines_file and not start:
+        sinks.append(JsonLinesSink(lines_file))
+    if write_file and not start:
+        sinks.append(JsonSink(write_file))
+    collected = ListSink() if columns_dir and store is None else None
+    if collected is not None:
+        sinks.append(collected)
+
+    pipeline = BuildPipeline(
+        lambda: SplitBanglaSyllables(pos_cache_path=pos_cache_file),
+        sinks,
+        workers=workers,
+        batch_size=batch_size,
+    )
+    pipeline.run_words(new_words, frequencies=counts)
+    print(pipeline.report())
+
+    if store is not None:
+        print(f"{pipeline.metrics['write'].words} words written to {store_file}")
+    # incremental: the frequencies of old words changed too, the exports are rewritten from the merged store
+    for path, Sink in ((lines_file, JsonLinesSink), (write_file, JsonSink)):
+        if path and start:
+            export = Sink(path)
+            export.open()
+            export.write(store.entries())
+            export.close(completed=True)
+        if path:
+            print(f"Word database written to {path}")
+
+    # statistics of the whole (merged) database, committed with the words by the store sink
+    stats = store_sink.stats if store is not None else corpus_stats(collected.entries) if columns_dir else None
+    if stats is not None:
+        print(f"stats  {stats['syllable_inventory']} distinct syllables, {len(stats['pos_distribution'])} POS tags")
+
+    # & as memory-mapped columns, for generators that restart often
+    if columns_dir:
+        entries = list(store.entries()) if store is not None else collected.entries
+        count = write_word_columns(entries, columns_dir, stats)
+        print(f"{count} words written to {columns_dir}")
+    if store is not None:
+        store.close()
 
 
 if __name__=="__main__":
-    create_word_database()
+    create_word_database(incremental="--incremental" in sys.argv)
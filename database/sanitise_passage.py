@@ -1,28 +1,175 @@
+''' // clean the scraped corpus down to bangla words, streaming & never in place
+
+    one precompiled pattern drops everything but bangla letters/signs & whitespace
+    (english letters & digits, bangla digits, ৷, punctuation, = - ’ ” ‚ ...)
+
+    words mode (default)      every word, space separated, in corpus order,         (what passage.txt holds)
+                              one line ending in a newline
+                              repeats are kept, create_db counts them as the words' frequency;
+                              --dedupe keeps only the first of each word (every frequency is then 1)
+    structure mode            same cleaning per line, lines & stanza breaks kept,    (for chhondo_analyzer.py)
+                              `=== poet — title ===` headers kept as they are
+
+    the output goes to a temp file next to the destination & is renamed over it only when complete,
+    so a crash never leaves a half written file, and the raw scrape is only read
+
+    python database/sanitise_passage.py [source] [destination] [--keep-structure] [--dedupe] [--workers N]
+'''
+
+import io
 import os
 import re
+import stat
+import sys
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from word_to_syllables.corpus_shards import CorpusShards, Shard, read_shard
+from word_to_syllables.normalize import normalize_text
+
+# not bangla (U+0980–U+09FF) & not whitespace, or a bangla digit (০-৯) / the danda ৷
+unwanted_chars_pattern = re.compile(r"[^\u0980-\u09E5\u09F0-\u09F6\u09F8-\u09FF\s]+")
+poem_header_pattern = re.compile(r"^===\s*(.*?)\s*===\s*$")
+
+CHUNK_SIZE = 1 << 20
+
+
+def clean_text(text: str) -> str:
+    return unwanted_chars_pattern.sub("", normalize_text(text))
+
+
+def iter_clean_words(f, chunk_size: int = CHUNK_SIZE):
+    """cleaned words of a text file, read `chunk_size` chars at a time"""
+    carry = ""
+    while chunk := f.read(chunk_size):
+        text = carry + chunk
+        # a word (or a letter + nukta pair) may go on in the next chunk, keep it back
+        cut = max(text.rfind(" "), text.rfind("\n"), text.rfind("\t"))
+        if cut < 0:
+            carry = text
+            continue
+        carry = text[cut + 1:]
+        yield from clean_text(text[:cut + 1]).split()
+    if carry:
+        yield from clean_text(carry).split()
+
+
+def clean_line(line: str) -> str | None:
+    """a header as it is, "" for a blank line, the cleaned words, or None if the cleaning left nothing"""
+    if poem_header_pattern.match(line):
+        return line.strip()
+    if not line.strip():
+        return ""
+    return " ".join(clean_text(line).split()) or None
+
+
+def collapse_blank_lines(lines):
+    """runs of blank lines as one, none at the start, lines emptied by the cleaning (None) dropped"""
+    blank = True  # no blank line at the start
+    for line in lines:
+        if line is None or (blank and not line):
+            continue
+        yield line
+        blank = not line
+
+
+def iter_clean_lines(f):
+    """cleaned lines of a text file, headers kept, runs of blank lines as one, lines emptied by the cleaning dropped"""
+    yield from collapse_blank_lines(clean_line(line) for line in f)
+
+
+# ---- shard workers (corpus_shards.py), each cleans its own byte range of the source
+
+def clean_shard_words(shard: Shard) -> list[str]:
+    return clean_text(read_shard(shard)).split()
+
+
+def clean_shard_lines(shard: Shard) -> list[str | None]:
+    # blank lines are collapsed in the parent, a run may go on over a shard cut
+    return [clean_line(line) for line in io.StringIO(read_shard(shard), newline=None)]
+
+
+def atomic_write(destination: str, pieces, mode_source: str | None = None) -> None:
+    """
+    write the strings of `pieces` to a temp file, then rename it to `destination`; the file gets the
+    permissions of the old `destination`, else of `mode_source` (mkstemp would leave it 0600)
+    """
+    directory = os.path.dirname(os.path.abspath(destination))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".sanitise-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            out.writelines(pieces)
+            out.flush()
+            os.fsync(out.fileno())
+        template = destination if os.path.exists(destination) else mode_source
+        if template is not None:
+            os.chmod(temp_path, stat.S_IMODE(os.stat(template).st_mode))
+        os.replace(temp_path, destination)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def sanitise_file(source: str, destination: str, keep_structure: bool = False, dedupe: bool = False, chunk_size: int = CHUNK_SIZE, workers: int = 1) -> dict[str, int]:
+    """
+    clean `source` into `destination` (may be the same path, it is only replaced once complete);
+    memory: one chunk (words mode, + the set of seen words when deduplicating) or one line (structure mode)
+    with `workers` > 1 the source is cut into byte-range shards cleaned in a process pool,
+    the output is the same; memory is then up to 2 shards per worker
+    :return: {"words": words written, "lines": lines written}
+    """
+    stats = {"words": 0, "lines": 0}
+
+    def words_mode(words):
+        seen: set[str] = set()
+        for word in words:
+            if dedupe:
+                if word in seen:
+                    continue
+                seen.add(word)
+            yield (" " if stats["words"] else "") + word
+            stats["words"] += 1
+        # ends in a separator, a scrape appended later can not glue its first word onto the last one
+        if stats["words"]:
+            yield "\n"
+        stats["lines"] = 1 if stats["words"] else 0
+
+    def structure_mode(lines):
+        for line in lines:
+            yield line + "\n"
+            stats["lines"] += 1
+            stats["words"] += len(line.split())
+
+    if workers > 1:
+        shards = CorpusShards(source, shards=workers, align="line" if keep_structure else "space")
+        if keep_structure:
+            lines = (line for result in shards.map(clean_shard_lines, workers) for line in result)
+            atomic_write(destination, structure_mode(collapse_blank_lines(lines)), source)
+        else:
+            words = (word for result in shards.map(clean_shard_words, workers) for word in result)
+            atomic_write(destination, words_mode(words), source)
+        return stats
+
+    with open(source, "r", encoding="utf-8") as f:
+        atomic_write(destination, structure_mode(iter_clean_lines(f)) if keep_structure else words_mode(iter_clean_words(f, chunk_size)), source)
+    return stats
+
 
 def clean_and_rewrite_file(filename: str):
-    with open(filename, "r", encoding="utf-8") as file:
-        text = file.read()
-
-    # Remove English letters, English digits, Bangla digits,
-    # plus the Bengali danda (৷), hyphen (-), equals (=), ’, ”, ‚
-    cleaned_text = re.sub(
-        r"[a-zA-Z0-9০-৯\u09F7\-=’”‚]",
-        "",
-        text
-    )
-    # Now remove any remaining non‑Bangla (U+0980–U+09FF) characters except whitespace
-    cleaned_text = re.sub(r"[^\u0980-\u09FF\s]", "", cleaned_text)
-
-    # Split into words and remove duplicates while maintaining order
-    words = cleaned_text.split()
-    unique_words = list(dict.fromkeys(words))
-
-    # Rewrite the file with cleaned and unique words
-    with open(filename, "w", encoding="utf-8") as file:
-        file.write(" ".join(unique_words))
+    """the old in-place clean of passage.txt, now crash safe (written aside, then renamed over it) & keeping repeated words"""
+    sanitise_file(filename, filename)
+
 
 if __name__ == "__main__":
-    file = os.path.join(os.getcwd(), "database", "passage.txt")
-    clean_and_rewrite_file(file)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="clean the scraped bangla corpus")
+    parser.add_argument("source", nargs="?", default=os.path.join(os.getcwd(), "database", "passage.txt"))
+    parser.add_argument("destination", nargs="?", default=os.path.join(os.getcwd(), "database", "passage.clean.txt"))
+    parser.add_argument("--keep-structure", action="store_true", help="keep lines, stanzas & poem headers")
+    parser.add_argument("--dedupe", action="store_true", help="words mode: only the first of each word (create_db then stores every frequency as 1)")
+    parser.add_argument("--workers", type=int, default=1, help="processes cleaning byte-range shards of the source")
+    args = parser.parse_args()
+
+    stats = sanitise_file(args.source, args.destination, keep_structure=args.keep_structure, dedupe=args.dedupe, workers=args.workers)
+    print(f"{stats['words']} words, {stats['lines']} lines written to {args.destination}")
@@ -0,0 +1,150 @@
+''' // columnar binary export of the word database, opened with np.memmap
+
+    db/words.columns/
+        matras.npy          uint8  (n, 3)    matra in SplitBanglaSyllables.chhondos order
+        pos.npy             uint8  (n,)      index into meta.json "pos_tags"
+        last_letter.npy     uint16 (n,)      code point of the word's last letter (rhyme matching)
+        frequency.npy       uint32 (n,)      occurrences in the corpus
+        word_offsets.npy    uint32 (n + 1,)  word i is words.bin[offsets[i]:offsets[i + 1]]
+        words.bin           utf-8 string pool
+        meta.json           chhondos, pos_tags, count, corpus_stats (see corpus_stats.py)
+
+    nothing is parsed on open, the arrays are memory-mapped read only, so opening takes milliseconds
+    & generator processes on the same machine share the pages through the OS page cache;
+    a rebuild writes a new directory & renames it over the old one, open WordColumns keep the old words
+'''
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+CHHONDOS = ("স্বরবৃত্ত", "মাত্রাবৃত্ত", "অক্ষরবৃত্ত")
+
+
+def swap_directory(staging: str, directory: str) -> None:
+    """rename `staging` to `directory`, the old `directory` (if any) is renamed aside first & then deleted"""
+    if not os.path.exists(directory):
+        os.rename(staging, directory)
+        return
+    retired = f"{staging}.old"
+    os.rename(directory, retired)
+    try:
+        os.rename(staging, directory)
+    except BaseException:
+        os.rename(retired, directory)
+        raise
+    # unlinking keeps the pages of mapped files alive until their last map is closed
+    shutil.rmtree(retired, ignore_errors=True)
+
+
+def write_word_columns(entries, directory: str, stats: dict | None = None) -> int:
+    """
+    write word entries (the dicts of db/words.json) as columns into `directory`,
+    with the build's corpus statistics in meta.json
+    :return: number of words written
+    """
+    entries = list(entries)
+    directory = os.path.abspath(directory)
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+
+    pos_tags = sorted({entry.get("POS") or "" for entry in entries})
+    pos_codes = {tag: code for code, tag in enumerate(pos_tags)}
+    if len(pos_tags) > 256:
+        raise ValueError(f"{len(pos_tags)} POS tags do not fit in uint8 codes")
+
+    matras = np.array([[entry["totalMatra"][chhondo] for chhondo in CHHONDOS] for entry in entries], dtype=np.uint8).reshape(-1, 3)
+    pos = np.array([pos_codes[entry.get("POS") or ""] for entry in entries], dtype=np.uint8)
+    last_letter = np.array([ord(entry["word"][-1]) if entry["word"] else 0 for entry in entries], dtype=np.uint16)
+    frequency = np.array([entry.get("frequency", 1) for entry in entries], dtype=np.uint32)
+
+    encoded = [entry["word"].encode("utf-8") for entry in entries]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+    np.cumsum([len(word) for word in encoded], out=offsets[1:])
+
+    # written into a new directory & swapped in whole: the files of the old one are never truncated,
+    # generators that still have them mapped keep reading the old words, and a crash leaves the old export as it was
+    staging = tempfile.mkdtemp(dir=parent, prefix=f".{os.path.basename(directory)}-", suffix=".tmp")
+    try:
+        np.save(os.path.join(staging, "matras.npy"), matras)
+        np.save(os.path.join(staging, "pos.npy"), pos)
+        np.save(os.path.join(staging, "last_letter.npy"), last_letter)
+        np.save(os.path.join(staging, "frequency.npy"), frequency)
+        np.save(os.path.join(staging, "word_offsets.npy"), offsets)
+        with open(os.path.join(staging, "words.bin"), "wb") as f:
+            f.write(b"".join(encoded))
+        with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"chhondos": CHHONDOS, "pos_tags": pos_tags, "count": len(entries), "corpus_stats": stats}, f, ensure_ascii=False)
+        os.chmod(staging, 0o755)  # mkdtemp makes it 0700
+        swap_directory(staging, directory)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return len(entries)
+
+
+class WordColumns:
+    """read only, memory-mapped view of a `write_word_columns` directory; same candidate API as WordStore"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.chhondos: tuple[str, ...] = tuple(meta["chhondos"])
+        self.pos_tags: list[str] = meta["pos_tags"]
+        self.count: int = meta["count"]
+        self.corpus_stats: dict | None = meta.get("corpus_stats")
+
+        open_column = lambda name: np.load(os.path.join(directory, name), mmap_mode="r")
+        self.matras = open_column("matras.npy")
+        self.pos = open_column("pos.npy")
+        self.last_letter = open_column("last_letter.npy")
+        self.frequency = open_column("frequency.npy")
+        self.word_offsets = open_column("word_offsets.npy")
+        pool_path = os.path.join(directory, "words.bin")
+        # np.memmap refuses an empty file
+        self.pool = np.memmap(pool_path, dtype=np.uint8, mode="r") if os.path.getsize(pool_path) else np.zeros(0, dtype=np.uint8)
+
+    def word(self, index: int) -> str:
+        start, end = self.word_offsets[index], self.word_offsets[index + 1]
+        return self.pool[start:end].tobytes().decode("utf-8")
+
+    def select(self, chhondo: str, matra: int, pos: str | None = None, last_letter: str | None = None) -> np.ndarray:
+        """indices of the words with `matra` in `chhondo` (& the POS tag / last letter)"""
+        if chhondo not in self.chhondos:
+            raise ValueError(f"unknown chhondo {chhondo!r}, expected one of {list(self.chhondos)}")
+
+        mask = self.matras[:, self.chhondos.index(chhondo)] == matra
+        if pos is not None:
+            if pos not in self.pos_tags:
+                return np.zeros(0, dtype=np.intp)
+            mask &= self.pos == self.pos_tags.index(pos)
+        if last_letter is not None:
+            mask &= self.last_letter == ord(last_letter)
+        return np.flatnonzero(mask)
+
+    def candidates(self, chhondo: str, matra: int, pos: str | None = None, last_letter: str | None = None) -> list[dict]:
+        """{"word", "pos", "frequency"} dicts like WordStore.candidates"""
+        return [
+            {"word": self.word(index), "pos": self.pos_tags[self.pos[index]] or None, "frequency": int(self.frequency[index])}
+            for index in self.select(chhondo, matra, pos, last_letter)
+        ]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self):
+        return f"<WordColumns> {self.directory} {self.count} words"
+
+
+if __name__ == "__main__":
+    import time
+
+    directory = os.path.join(os.getcwd(), "database", "db", "words.columns")
+    start = time.perf_counter()
+    columns = WordColumns(directory)
+    print(f"{columns} opened in {(time.perf_counter() - start) * 1e3:.2f} ms")
+    print(columns.candidates("স্বরবৃত্ত", 4, last_letter="ল")[:10])
@@ -0,0 +1,60 @@
+''' // JSON Lines word database: db/words.jsonl, one words.json entry per line
+
+    written by the build as the entries come out of the pipeline (flushed per chunk) into words.jsonl.tmp,
+    so memory stays flat, & renamed over words.jsonl when the build completed;
+    read lazily, one entry at a time
+'''
+
+import json
+import os
+
+
+class JsonLinesSink:
+    """write-stage sink of BuildPipeline, (re)writes the whole file aside & swaps it in only if the build completed"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.temp_path = f"{path}.tmp"
+        self.count = 0
+
+    def open(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.file = open(self.temp_path, "w", encoding="utf-8")
+
+    def write(self, entries) -> None:
+        for entry in entries:
+            self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.count += 1
+        self.file.flush()
+
+    def close(self, completed: bool) -> None:
+        # generators read words.jsonl, they never see a partial corpus
+        self.file.close()
+        if completed:
+            os.replace(self.temp_path, self.path)
+        else:
+            os.remove(self.temp_path)
+
+
+def iter_word_lines(path: str):
+    """
+    yields the entries of a words.jsonl file one at a time; a cut off last line
+    (a build killed mid-write) is skipped
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    pass
+                return
+            if line.strip():
+                yield json.loads(line)
+
+
+if __name__ == "__main__":
+    from itertools import islice
+
+    for entry in islice(iter_word_lines(os.path.join(os.getcwd(), "database", "db", "words.jsonl")), 5):
+        print(entry)
@@ -0,0 +1,215 @@
+''' // SQLite word store, the queryable twin of db/words.json
+
+    TABLE words (one row per word)
+        word, syllables (json list),
+        swarabritta, matrabritta, aksharabritta     -- matra in each chhondo
+        pos,
+        rhyme_key                                   -- last syllable without its hosonto, eg কমল -> মল
+        last_letter                                 -- what PoemGenerator matches rhymes on
+        frequency                                   -- occurrences in the corpus
+
+    the table is keyed by word (WITHOUT ROWID), so every index below also carries the word & covers the
+    generator's candidate queries, eg "matra 4 in স্বরবৃত্ত ending in ল" is one index range scan:
+        (<matra column>, last_letter, pos, frequency), (<matra column>, rhyme_key, pos, frequency), (<matra column>, pos, frequency)
+'''
+
+import json
+import os
+import pathlib
+import sqlite3
+
+# chhondo -> column, in SplitBanglaSyllables.chhondos order
+matra_columns: dict[str, str] = {
+    "স্বরবৃত্ত": "swarabritta",
+    "মাত্রাবৃত্ত": "matrabritta",
+    "অক্ষরবৃত্ত": "aksharabritta",
+}
+
+HOSONTO = "্"
+
+
+def rhyme_key(syllables: list[str]) -> str:
+    return syllables[-1].rstrip(HOSONTO) if syllables else ""
+
+
+class WordStore:
+    # sqlite allows 999 host parameters per statement on older builds
+    query_chunk_size: int = 900
+
+    def __init__(self, path: str, read_only: bool = False):
+        """
+        `read_only=True` opens an existing store for lookups only (generators, the server): nothing
+        is created or written, and sqlite refuses writes through this connection
+        """
+        self.path = path
+        self.read_only = read_only
+        if read_only:
+            self.conn = sqlite3.connect(f"{pathlib.Path(os.path.abspath(path)).as_uri()}?mode=ro", uri=True)
+            return
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        # WAL: readers (generators, the incremental build's new word check) are never blocked by a bulk load
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS words (
+                word TEXT NOT NULL PRIMARY KEY,
+                syllables TEXT NOT NULL,
+                swarabritta INTEGER NOT NULL,
+                matrabritta INTEGER NOT NULL,
+                aksharabritta INTEGER NOT NULL,
+                pos TEXT,
+                rhyme_key TEXT NOT NULL,
+                last_letter TEXT NOT NULL,
+                frequency INTEGER NOT NULL DEFAULT 1
+            ) WITHOUT ROWID"""
+        )
+        for column in matra_columns.values():
+            for key in ("last_letter", "rhyme_key"):
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS words_{column}_{key} ON words ({column}, {key}, pos, frequency)")
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS words_{column}_pos ON words ({column}, pos, frequency)")
+        # build bookkeeping, eg the corpus watermark of incremental builds
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT NOT NULL PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID")
+        self.conn.commit()
+
+    def write_words(self, entries, replace_all: bool = False, meta: dict | None = None) -> int:
+        """
+        Bulk load word entries (the dicts of db/words.json) with one executemany in a
+        single transaction; a word already in the store is replaced.
+        With `replace_all` the old words are deleted first, in the same transaction.
+        `meta` ({key: JSON-able value}) is saved in that transaction too, so it always matches the words.
+        :return: number of entries written
+        """
+        self.begin(replace_all)
+        try:
+            count = self.add_words(entries)
+            self.commit(meta)
+        except BaseException:
+            self.conn.rollback()
+            raise
+        return count
+
+    # ---- a bulk load in parts, for builds that produce the words in chunks: begin, add_words * n, commit
+
+    def begin(self, replace_all: bool = False) -> None:
+        self.conn.execute("BEGIN")
+        if replace_all:
+            self.conn.execute("DELETE FROM words")
+
+    def add_words(self, entries) -> int:
+        """insert inside the open transaction, see `begin`"""
+        rows = [
+            (
+                entry["word"],
+                json.dumps(entry["syllables"], ensure_ascii=False),
+                *(entry["totalMatra"][chhondo] for chhondo in matra_columns),
+                entry.get("POS"),
+                rhyme_key(entry["syllables"]),
+                entry["word"][-1:],
+                entry.get("frequency", 1),
+            )
+            for entry in entries
+        ]
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO words (word, syllables, swarabritta, matrabritta, aksharabritta, pos, rhyme_key, last_letter, frequency) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    def add_frequencies(self, counts: dict[str, int]) -> None:
+        """add new occurrences of words already in the store, inside the open transaction"""
+        self.conn.executemany("UPDATE words SET frequency = frequency + ? WHERE word = ?", [(count, word) for word, count in counts.items()])
+
+    def commit(self, meta: dict | None = None) -> None:
+        if meta:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False)) for key, value in meta.items()],
+            )
+        self.conn.commit()
+
+    def get_meta(self, key: str):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @property
+    def corpus_stats(self) -> dict | None:
+        """the statistics the build saved with the words (database/corpus_stats.py), None for older stores"""
+        return self.get_meta("corpus_stats")
+
+    def known_words(self, words) -> set[str]:
+        """the ones of `words` already in the store"""
+        words = list(dict.fromkeys(words))
+        known: set[str] = set()
+        for start in range(0, len(words), self.query_chunk_size):
+            chunk = words[start:start + self.query_chunk_size]
+            placeholders = ", ".join("?" * len(chunk))
+            known.update(word for (word,) in self.conn.execute(f"SELECT word FROM words WHERE word IN ({placeholders})", chunk))
+        return known
+
+    def entries(self):
+        """every word as a words.json style entry, in word order"""
+        for word, syllables, *matras, pos, frequency in self.conn.execute(
+            "SELECT word, syllables, swarabritta, matrabritta, aksharabritta, pos, frequency FROM words ORDER BY word"
+        ):
+            yield {"word": word, "syllables": json.loads(syllables), "totalMatra": dict(zip(matra_columns, matras)), "POS": pos, "frequency": frequency}
+
+    def candidates(self, chhondo: str, matra: int, pos: str | None = None, rhyme: str | None = None, last_letter: str | None = None) -> list[dict]:
+        """
+        words with `matra` in `chhondo`, optionally also with the POS tag, rhyme key or last letter,
+        as {"word", "pos", "frequency"} dicts like the entries PoemGenerator picks from
+        :raises ValueError: for an unknown chhondo
+        """
+        if chhondo not in matra_columns:
+            raise ValueError(f"unknown chhondo {chhondo!r}, expected one of {list(matra_columns)}")
+
+        column = matra_columns[chhondo]
+        conditions, params = [f"{column} = ?"], [matra]
+        for name, value in (("pos", pos), ("rhyme_key", rhyme), ("last_letter", last_letter)):
+            if value is not None:
+                conditions.append(f"{name} = ?")
+                params.append(value)
+
+        query = f"SELECT word, pos, frequency FROM words WHERE {' AND '.join(conditions)}"
+        return [{"word": word, "pos": tag, "frequency": frequency} for word, tag, frequency in self.conn.execute(query, params)]
+
+    def get(self, word: str) -> dict | None:
+        """the words.json style entry of `word`"""
+        row = self.conn.execute(
+            "SELECT word, syllables, swarabritta, matrabritta, aksharabritta, pos, frequency FROM words WHERE word = ?", (word,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "word": row[0],
+            "syllables": json.loads(row[1]),
+            "totalMatra": dict(zip(matra_columns, row[2:5])),
+            "POS": row[5],
+            "frequency": row[6],
+        }
+
+    def explain(self, chhondo: str, matra: int, last_letter: str) -> list[str]:
+        """sqlite's query plan of a rhyme candidate query, to check it is an index search"""
+        column = matra_columns[chhondo]
+        plan = self.conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT word, pos, frequency FROM words WHERE {column} = ? AND last_letter = ?", (matra, last_letter)
+        )
+        return [row[-1] for row in plan]
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __repr__(self):
+        return f"<WordStore> {self.path}{' (read only)' if self.read_only else ''}"
+
+
+if __name__ == "__main__":
+    store = WordStore(os.path.join(os.getcwd(), "database", "db", "words.sqlite"), read_only=True)
+    print(store, len(store))
+    print(store.explain("স্বরবৃত্ত", 4, "ল"))
+    print(store.candidates("স্বরবৃত্ত", 4, last_letter="ল")[:10])
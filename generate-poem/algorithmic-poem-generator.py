@@ -2,14 +2,27 @@ import os
 import re
 import json
 import random
+import sys
 from typing import List, Dict, Tuple, Any
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.corpus_stats import corpus_stats, matra_count
+from database.word_columns import WordColumns
+from database.word_lines import iter_word_lines
+from database.word_store import WordStore
 
 class PoemGenerator:
     database_path = 'database/db/words.json'
-    words_cache: Dict[int, List[Dict[str, Any]]] = {}  # cache valid words by matra
+    lines_path = 'database/db/words.jsonl'
+    store_path = 'database/db/words.sqlite'
+    columns_path = 'database/db/words.columns'
 
-    def __init__(self, pattern: str = '4|4|2'):
+    def __init__(self, pattern: str = '4|4|2', words: List[Dict[str, Any]] | None = None, store: WordStore | WordColumns | None = None, weight_by_frequency: bool = False, stats: Dict[str, Any] | None = None):
         self.pattern = pattern
+        self.words = words  # the words of the database, read on first use if not given
+        self.store = store  # with a store (sqlite or memory-mapped columns), candidates are looked up there & words.json is never read
+        self.words_cache: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}  # cache valid words by (chhondo, matra), of this generator's words / store
+        self.weight_by_frequency = weight_by_frequency  # common words of the corpus get picked more often
+        self.stats = stats  # corpus statistics (database/corpus_stats.py), from the store or the words if not given
 
     def determine_chhondo(self, pattern) -> Tuple[str, List[int]]:
         if not pattern:
@@ -28,16 +41,60 @@ class PoemGenerator:
             chhondo = "অক্ষরবৃত্ত"
         else:
             raise Exception("matra at max can be 10")
+        # reject a pattern the database can not fill now, not half way through a poem
+        for matra in sorted(set(extracted_pattern)):
+            if not self.feasible_splits(chhondo, matra):
+                raise Exception(f"No words available for matra {matra} in {chhondo}, not even split as {self.get_allowed_splits(matra)}")
         return chhondo, extracted_pattern
 
+    def load_stats(self) -> Dict[str, Any] | None:
+        # None for a store built before corpus statistics or no built database, nothing is rejected early then
+        if self.stats is None:
+            if self.store is not None:
+                self.stats = self.store.corpus_stats or {}
+            else:
+                try:
+                    self.stats = corpus_stats(self.load_words())
+                except FileNotFoundError:
+                    self.stats = {}
+        return self.stats or None
+
+    def feasible_splits(self, chhondo: str, m: int) -> List[List[int]]:
+        # the allowed splits of `m` whose every piece has words of that matra
+        stats = self.load_stats()
+        splits = self.get_allowed_splits(m)
+        if stats is None:
+            return splits
+        return [split for split in splits if all(matra_count(stats, chhondo, piece) for piece in split)]
+
     def find_valid_words(self, words_list: List[Dict[str, Any]], chhondo: str, matra: int) -> List[Dict[str, Any]]:
         # fetch from cache if available
-        if matra in self.words_cache:
-            return self.words_cache[matra]
-        valid = [w for w in words_list if w['totalMatra'].get(chhondo, 0) == matra]
-        self.words_cache[matra] = valid
+        key = (chhondo, matra)
+        if key in self.words_cache:
+            return self.words_cache[key]
+        if self.store is not None:
+            valid = self.store.candidates(chhondo, matra)
+        else:
+            valid = [w for w in words_list if w['totalMatra'].get(chhondo, 0) == matra]
+        self.words_cache[key] = valid
         return valid
 
+    def pick_word(self, candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if self.weight_by_frequency:
+            return random.choices(candidates, weights=[w.get('frequency') or 1 for w in candidates])[0]
+        return random.choice(candidates)
+
+    def pick_fresh_word(self, candidates: List[Dict[str, Any]], used: set) -> Dict[str, Any]:
+        # a word not in `used` (any word if all are): a few random draws first, the candidate lists
+        # are thousands of words & a line only a handful, filtering the whole list is the rare case
+        if not self.weight_by_frequency:
+            for _ in range(8):
+                choice = random.choice(candidates)
+                if choice['word'] not in used:
+                    return choice
+        fresh = [w for w in candidates if w['word'] not in used]
+        return self.pick_word(fresh or candidates)
+
     def get_allowed_splits(self, m: int) -> List[List[int]]:
         match m:
             case 2 | 3:
@@ -66,11 +123,8 @@ class PoemGenerator:
         if not isinstance(lines_to_generate, int):
             raise Exception("Invalid input: stanza count and lines per stanza must be integers")
 
-        # load words once
-        with open(self.database_path, 'r') as f:
-            data = json.load(f)
-        words_list = data.get("words") or []
-        if not words_list:
+        words_list = [] if self.store is not None else self.load_words()
+        if self.store is None and not words_list:
             raise Exception("Unable to retrieve json words data")
 
         poem = []
@@ -81,26 +135,27 @@ class PoemGenerator:
             used_in_line = set()
             line_words: List[str] = []
             for matra in extracted_pattern:
-                # get possible splits
-                splits = self.get_allowed_splits(matra)
+                # get possible splits, the ones with a piece no word has are left out
+                splits = self.feasible_splits(chhondo, matra)
                 # choose a split randomly
                 split = random.choice(splits)
                 # for each piece in split, pick a word
                 for idx, piece in enumerate(split):
                     candidates = self.find_valid_words(words_list, chhondo, piece)
-                    # avoid duplicates in same line
-                    fresh = [w for w in candidates if w['word'] not in used_in_line]
-                    if not fresh:
-                        fresh = candidates
+                    pool = candidates
                     # if match_last for last piece in even line
                     if match_last and not is_odd_line and idx == len(split) - 1 and last_word_of_prev_line:
                         last_char = last_word_of_prev_line[-1]
-                        matched = [w for w in fresh if w['word'].endswith(last_char)]
+                        if self.store is not None:
+                            matched = [w for w in self.store.candidates(chhondo, piece, last_letter=last_char) if w['word'] not in used_in_line]
+                        else:
+                            matched = [w for w in candidates if w['word'].endswith(last_char) and w['word'] not in used_in_line]
                         if matched:
-                            fresh = matched
-                    if not fresh:
+                            pool = matched
+                    if not pool:
                         raise Exception(f"No words available for matra {piece}")
-                    choice = random.choice(fresh)
+                    # avoid duplicates in same line
+                    choice = self.pick_fresh_word(pool, used_in_line)
                     used_in_line.add(choice['word'])
                     line_words.append(choice['word'])
             poem.append(" ".join(line_words))
@@ -110,17 +165,22 @@ class PoemGenerator:
 
     # ---- #
     def load_words(self) -> List[Dict[str,Any]]:
-        with open(self.database_path) as f:
-            data = json.load(f)
-        return data.get('words', [])
+        # read once per generator, line by line from words.jsonl if the build wrote one
+        if self.words is None:
+            if os.path.exists(self.lines_path):
+                self.words = list(iter_word_lines(self.lines_path))
+            else:
+                with open(self.database_path) as f:
+                    data = json.load(f)
+                self.words = data.get('words') or []
+        return self.words
 
     def find_valid(self, words: List[Dict[str, Any]], ch: str, m: int, pos: str = None) -> List[Dict[str, Any]]:
-        key = (ch, m)
-        if key not in self.words_cache:
-            self.words_cache[key] = [w for w in words if w['totalMatra'].get(ch,0)==m]
-        cand = self.words_cache[key]
+        cand = self.find_valid_words(words, ch, m)
+        if pos and self.store is not None:
+            return self.store.candidates(ch, m, pos=pos) or cand
         if pos:
-            pos_cand = [w for w in cand if w.get('pos')==pos]
+            pos_cand = [w for w in cand if (w.get('pos') or w.get('POS'))==pos]
             return pos_cand or cand
         return cand
 
@@ -152,11 +212,9 @@ class PoemGenerator:
 
         pos_sequence = grammar_rules[L]
 
-        # 3) load word database
-        with open(self.database_path, 'r') as f:
-            data = json.load(f)
-        words_list = data.get("words") or []
-        if not words_list:
+        # 3) word database
+        words_list = [] if self.store is not None else self.load_words()
+        if self.store is None and not words_list:
             raise Exception("Unable to retrieve json words data")
 
         # 4) pick one word per slot
@@ -166,16 +224,13 @@ class PoemGenerator:
         for _ in range(lines_to_generate):
             for idx, matra in enumerate(extracted_pattern):
                 desired_pos = pos_sequence[idx]
-                # matra-filtered
-                candidates = self.find_valid_words(words_list, chhondo, matra)
-                # POS-filtered
-                pos_candidates = [w for w in candidates if w.get("pos") == desired_pos]
-                pool = pos_candidates or candidates  # fallback if no POS match
+                # matra & POS-filtered, all of the matra if no POS match
+                pool = self.find_valid(words_list, chhondo, matra, pos=desired_pos)
                 # avoid repetition
                 fresh = [w for w in pool if w["word"] not in used] or pool
                 if not fresh:
                     raise Exception(f"No words for matra={matra}, POS={desired_pos}")
-                choice = random.choice(fresh)
+                choice = self.pick_word(fresh)
                 used.add(choice["word"])
                 sentence_tokens.append(choice["word"])
 
@@ -185,7 +240,7 @@ class PoemGenerator:
     def generate_poem_with_grammar2(self, lines_to_generate: int = 2) -> List[str]:
         # Build a 4-line poem with AABB rhyme scheme
         ch, pattern = self.determine_chhondo(self.pattern)
-        words = self.load_words()
+        words = [] if self.store is not None else self.load_words()
 
         # Phrase grammar rules
         grammar = {
@@ -240,8 +295,11 @@ class PoemGenerator:
             last_word = current.split()[-1]
             if last_word.endswith(end_char):
                 return current
-            # find replacement
-            repl = [w for w in words if w['word'].endswith(end_char) and w.get('pos')==pos]
+            # find replacement, same matra as the rhyme slot
+            if self.store is not None:
+                repl = self.store.candidates(ch, pattern[-1], pos=pos, last_letter=end_char)
+            else:
+                repl = [w for w in self.find_valid_words(words, ch, pattern[-1]) if w['word'].endswith(end_char) and (w.get('pos') or w.get('POS'))==pos]
             if repl:
                 return ' '.join(current.split()[:-1] + [random.choice(repl)['word']])
             return current
@@ -256,7 +314,12 @@ if __name__ == "__main__":
     pattern = "4|4|4|2"
     lines_to_generate = 2
     match_last = True
-    pg = PoemGenerator(pattern)
+    store = None
+    if os.path.exists(os.path.join(PoemGenerator.columns_path, 'meta.json')):
+        store = WordColumns(PoemGenerator.columns_path)
+    elif os.path.exists(PoemGenerator.store_path):
+        store = WordStore(PoemGenerator.store_path, read_only=True)
+    pg = PoemGenerator(pattern, store=store)
     out_dir = os.path.join(os.getcwd(), 'generate-poem')
 
 
@@ -265,7 +328,7 @@ if __name__ == "__main__":
     with open(op_file, 'a', encoding='utf-8') as f:
         f.write(f"\n{pattern} \n----------\n")
         for line in poem:
-            f.write(f"{"".join(line)}\n")
+            f.write(f"{''.join(line)}\n")
         f.write('\n')
 
 
@@ -274,32 +337,16 @@ if __name__ == "__main__":
 
     with open(op_file, 'a', encoding='utf-8') as f:
         f.write(f"\n{pattern} \n----------\n")
-        f.write(f"{"".join(pg.generate_poem_with_grammar1())}\n")
+        f.write(f"{''.join(pg.generate_poem_with_grammar1())}\n")
         f.write('\n')
 
     poem = pg.generate_poem_with_grammar2()
     with open(op_file, 'a', encoding='utf-8') as f:
         f.write(f"\n{pattern} \n----------\n")
         for line in poem:
-            f.write(f"{"".join(line)}\n")
+            f.write(f"{''.join(line)}\n")
         f.write('\n')
 
 
-# matra     s-b     m-b     a-b
-# 1     :   1380    920     668
-# 2     :   9231    1943    5235
-# 3     :   7267    4690    8822
-# 4     :   3170    5237    5095
-# 5     :   817     4145    1712
-# 6     :   189     2359    470
-# 7     :   59      1644    94
-# 8     :   14      806     32
-# 9     :   10      394     10
-# 10    :   2       222     6
-# 11    :   1       88      1
-# 12    :   2       40      2
-# 13    :   0       33      1
-# 14    :   0       10      0
-# 15    :   0       7       0
-# 16    :   0       6       1
-# 17    :   0       5       0
+# matra histograms (s-b / m-b / a-b words per matra) are computed by the database build,
+# python database/corpus_stats.py prints them
@@ -167,21 +167,5 @@ if __name__ == "__main__":
 # semi-automata: give it a m•n+k sequence, it will recognise all chondo-matra-riti etc || give it svo str & it will constract a new
 # and then it will construct a new seq with same proerties, and will also match the last syllable of words/lat word to rhyme
 
-# matra     s-b     m-b     a-b
-# 1     :   1380    920     668
-# 2     :   9231    1943    5235
-# 3     :   7267    4690    8822
-# 4     :   3170    5237    5095
-# 5     :   817     4145    1712
-# 6     :   189     2359    470
-# 7     :   59      1644    94
-# 8     :   14      806     32
-# 9     :   10      394     10
-# 10    :   2       222     6
-# 11    :   1       88      1
-# 12    :   2       40      2
-# 13    :   0       33      1
-# 14    :   0       10      0
-# 15    :   0       7       0
-# 16    :   0       6       1
-# 17    :   0       5       0
+# matra histograms (s-b / m-b / a-b words per matra) are computed by the database build,
+# python database/corpus_stats.py prints them
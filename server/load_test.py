@@ -0,0 +1,88 @@
+''' // load test of server.py: req/s & latency percentiles per endpoint
+
+    `concurrency` keep-alive connections each send requests back to back for `duration` seconds,
+    the request texts are lines of database/passage.txt words
+
+    python server/server.py --workers 2 --no-pos &
+    python server/load_test.py --concurrency 32 --duration 10 [--endpoints /syllables /matra /poem]
+'''
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from urllib.parse import urlencode
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from word_to_syllables.splitBanglaSyllables import SplitBanglaSyllables
+
+PASSAGE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'database', 'passage.txt')
+
+
+def sample_texts(count: int = 500, words_per_text: int = 8) -> list[str]:
+    words = [word for _, word in zip(range(count * words_per_text), SplitBanglaSyllables(syllables_only=True).iter_words(PASSAGE_FILE))]
+    return [" ".join(words[i:i + words_per_text]) for i in range(0, len(words), words_per_text)]
+
+
+def request_target(endpoint: str, texts: list[str]) -> str:
+    if endpoint == "/poem":
+        return "/poem?" + urlencode({"pattern": random.choice(["4|4|2", "4|4|4|2", "6|6|2", "8|6"]), "lines": 4})
+    return f"{endpoint}?" + urlencode({"text": random.choice(texts)})
+
+
+async def client(host: str, port: int, endpoint: str, texts: list[str], stop_at: float, latencies: list[float], errors: list[int]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            writer.write(f"GET {request_target(endpoint, texts)} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            json.loads(await reader.readexactly(length))
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def load_test(host: str, port: int, endpoint: str, texts: list[str], concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors: list[int] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, endpoint, texts, start + duration, latencies, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    at = lambda fraction: latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1e3 if latencies else 0.0
+    return {
+        "endpoint": endpoint,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "req_per_sec": len(latencies) / elapsed,
+        "p50_ms": at(0.50),
+        "p99_ms": at(0.99),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="load test the local syllable service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per endpoint")
+    parser.add_argument("--endpoints", nargs="+", default=["/syllables", "/matra", "/pos", "/poem"])
+    args = parser.parse_args()
+
+    texts = sample_texts()
+    print(f"{'endpoint':<12} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for endpoint in args.endpoints:
+        stats = asyncio.run(load_test(args.host, args.port, endpoint, texts, args.concurrency, args.duration))
+        print(f"{stats['endpoint']:<12} {stats['requests']:>9} {stats['errors']:>7} {stats['req_per_sec']:>9.0f} {stats['p50_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
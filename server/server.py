@@ -0,0 +1,399 @@
+''' // long lived local HTTP service over SplitBanglaSyllables & PoemGenerator
+
+    everything expensive is set up once at start: the POS model, the word database, the worker pool
+        GET/POST /syllables  text=...                     -> [{"word", "syllables"}]
+        GET/POST /matra      text=...                     -> [{"word", "syllables", "matras"}]
+        GET/POST /pos        text=...                     -> [{"word", "pos"}]
+        GET/POST /poem       pattern=4|4|2 lines=2 match_last=1  -> {"pattern", "chhondo", "poem"}
+    parameters come from the query string or a JSON body
+
+    syllables & matras run in a process pool (the splitter is pure python, CPU bound);
+    POS requests arriving together are merged into one model batch, run on a single thread
+    that owns the model & the POS cache
+
+    python server/server.py --port 8080 --workers 2 [--no-pos] [--pos-cache database/db/pos_cache.sqlite]
+    numbers: server/load-test.md
+'''
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.word_store import WordStore, rhyme_key
+from word_to_syllables.splitBanglaSyllables import SplitBanglaSyllables
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+GENERATOR_FILE = os.path.join(REPO_DIR, 'generate-poem', 'algorithmic-poem-generator.py')
+DATABASE_FILE = os.path.join(REPO_DIR, 'database', 'db', 'words.json')
+
+MAX_BODY_BYTES = 1 << 20
+MAX_TEXT_WORDS = 10000
+
+# the splitter of a pool worker, built once by `init_worker`
+worker_splitter: SplitBanglaSyllables | None = None
+
+
+def init_worker(syllable_cache_size: int) -> None:
+    global worker_splitter
+    worker_splitter = SplitBanglaSyllables(syllables_only=True, syllable_cache_size=syllable_cache_size)
+
+
+def syllables_of(text: str, with_matras: bool) -> list[dict]:
+    """runs in a pool worker"""
+    records = []
+    for word, syllables in worker_splitter.iter_syllables([text]):
+        record = {"word": word, "syllables": syllables}
+        if with_matras:
+            record["matras"] = worker_splitter.get_all_matras(syllables)
+        records.append(record)
+        if len(records) > MAX_TEXT_WORDS:
+            raise ValueError(f"text has more than {MAX_TEXT_WORDS} words")
+    return records
+
+
+def load_poem_generator_class():
+    """PoemGenerator from generate-poem/ (not importable by name, the folder has a hyphen)"""
+    spec = importlib.util.spec_from_file_location("algorithmic_poem_generator", GENERATOR_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.PoemGenerator
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class PosBatcher:
+    """
+    Collects the words of concurrent /pos requests & tags them in one model call.
+    A batch is sent when it reaches `batch_size` words or `max_delay` seconds after its first word.
+    """
+
+    def __init__(self, splitter_factory, batch_size: int = 64, max_delay: float = 0.005):
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        # the model & the sqlite POS cache are only ever touched from this one thread
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pos")
+        self.splitter: SplitBanglaSyllables | None = None
+        self.splitter_factory = splitter_factory
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task: asyncio.Task | None = None
+        self.batches = 0
+        self.words = 0
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self.splitter = await loop.run_in_executor(self.executor, self.warm)
+        self.task = asyncio.create_task(self.run())
+
+    def warm(self) -> SplitBanglaSyllables:
+        splitter = self.splitter_factory()
+        splitter.pipeline  # load the model now, not on the first request
+        return splitter
+
+    async def tag(self, words: list[str]) -> list[str]:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((words, future))
+        return await future
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_delay
+            while size < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            words = [word for request_words, _ in pending for word in request_words]
+            try:
+                tags = await loop.run_in_executor(self.executor, self.splitter.get_parts_of_speech_batch, words, self.batch_size)
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.words += len(words)
+            start = 0
+            for request_words, future in pending:
+                if not future.done():
+                    future.set_result(tags[start:start + len(request_words)])
+                start += len(request_words)
+
+    async def close(self) -> None:
+        if self.task:
+            self.task.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class CandidateIndex:
+    """
+    the words of words.json grouped by (chhondo, matra) & by (chhondo, matra, last letter), built once at
+    startup & shared by every /poem request; same candidates() as WordStore, so it is passed as the
+    generators' `store`. The returned lists are shared, callers must not change them.
+    """
+
+    def __init__(self, words: list[dict], stats: dict | None = None):
+        self.corpus_stats = stats
+        self.by_matra: dict[tuple[str, int], list[dict]] = {}
+        self.by_last_letter: dict[tuple[str, int, str], list[dict]] = {}
+        self.rhyme_keys: dict[str, str] = {}
+        for entry in words:
+            word = entry["word"]
+            candidate = {"word": word, "pos": entry.get("POS"), "frequency": entry.get("frequency", 1)}
+            self.rhyme_keys[word] = rhyme_key(entry["syllables"])
+            for chhondo, matra in entry["totalMatra"].items():
+                self.by_matra.setdefault((chhondo, matra), []).append(candidate)
+                self.by_last_letter.setdefault((chhondo, matra, word[-1:]), []).append(candidate)
+
+    def candidates(self, chhondo: str, matra: int, pos: str | None = None, rhyme: str | None = None, last_letter: str | None = None) -> list[dict]:
+        if last_letter is not None:
+            pool = self.by_last_letter.get((chhondo, matra, last_letter), [])
+        else:
+            pool = self.by_matra.get((chhondo, matra), [])
+        if pos is not None:
+            pool = [candidate for candidate in pool if candidate["pos"] == pos]
+        if rhyme is not None:
+            pool = [candidate for candidate in pool if self.rhyme_keys[candidate["word"]] == rhyme]
+        return pool
+
+    def __len__(self) -> int:
+        return len(self.rhyme_keys)
+
+    def __repr__(self):
+        return f"<CandidateIndex> {len(self)} words"
+
+
+class SyllableService:
+    def __init__(self, workers: int = 1, pos: bool = True, pos_cache_path: str | None = None, database_path: str = DATABASE_FILE, syllable_cache_size: int = 1 << 15):
+        self.workers = workers
+        self.syllable_cache_size = syllable_cache_size
+        self.pool: ProcessPoolExecutor | None = None
+        self.pos_batcher = PosBatcher(lambda: SplitBanglaSyllables(pos_cache_path=pos_cache_path)) if pos else None
+        self.database_path = database_path
+        self.PoemGenerator = None
+        self.candidate_index: CandidateIndex | None = None
+        self.stats: dict | None = None
+        self.routes = {
+            "/syllables": self.syllables,
+            "/matra": self.matra,
+            "/pos": self.pos,
+            "/poem": self.poem,
+        }
+
+    async def start(self) -> None:
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=(self.syllable_cache_size,))
+        # fork the workers now, not on the first request
+        await asyncio.gather(*(asyncio.get_running_loop().run_in_executor(self.pool, syllables_of, "", False) for _ in range(self.workers)))
+
+        self.PoemGenerator = load_poem_generator_class()
+        if os.path.exists(self.database_path):
+            # read & indexed once, not per /poem request; the statistics let every generator reject impossible patterns
+            self.stats = self.read_stats()
+            self.candidate_index = CandidateIndex(self.read_words(), self.stats)
+        else:
+            print(f"word database {self.database_path} not found, /poem is disabled", file=sys.stderr)
+
+        if self.pos_batcher:
+            await self.pos_batcher.start()
+
+    def read_words(self) -> list[dict]:
+        with open(self.database_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("words") or []
+
+    def read_stats(self) -> dict:
+        """the corpus statistics the build saved next to words.json, {} (no early rejection) if there are none"""
+        directory = os.path.dirname(self.database_path)
+        columns_meta = os.path.join(directory, "words.columns", "meta.json")
+        store_path = os.path.join(directory, "words.sqlite")
+        if os.path.exists(columns_meta):
+            with open(columns_meta, "r", encoding="utf-8") as f:
+                stats = json.load(f).get("corpus_stats")
+        elif os.path.exists(store_path):
+            store = WordStore(store_path, read_only=True)
+            stats = store.corpus_stats
+            store.close()
+        else:
+            stats = None
+        return stats or {}
+
+    async def close(self) -> None:
+        if self.pos_batcher:
+            await self.pos_batcher.close()
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    # ---- endpoints, each gets the request parameters & returns a JSON-able value
+
+    def text_param(self, params: dict) -> str:
+        text = params.get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise HTTPError(400, "`text` is required")
+        return text
+
+    async def split(self, params: dict, with_matras: bool) -> list[dict]:
+        text = self.text_param(params)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, syllables_of, text, with_matras)
+        except ValueError as e:
+            raise HTTPError(413, str(e))
+
+    async def syllables(self, params: dict) -> list[dict]:
+        return await self.split(params, with_matras=False)
+
+    async def matra(self, params: dict) -> list[dict]:
+        return await self.split(params, with_matras=True)
+
+    async def pos(self, params: dict) -> list[dict]:
+        if not self.pos_batcher:
+            raise HTTPError(503, "POS tagging is disabled (--no-pos)")
+        words = [record["word"] for record in await self.split(params, with_matras=False)]
+        try:
+            tags = await self.pos_batcher.tag(words)
+        except (RuntimeError, ValueError) as e:
+            raise HTTPError(500, str(e))
+        return [{"word": word, "pos": tag} for word, tag in zip(words, tags)]
+
+    async def poem(self, params: dict) -> dict:
+        if not self.candidate_index:
+            raise HTTPError(503, "word database not loaded")
+        pattern = str(params.get("pattern", "4|4|2"))
+        try:
+            lines = int(params.get("lines", 2))
+        except ValueError:
+            raise HTTPError(400, "`lines` must be an integer")
+        if not 1 <= lines <= 32:
+            raise HTTPError(400, "`lines` must be between 1 and 32")
+        match_last = str(params.get("match_last", "1")).lower() not in ("0", "false", "no")
+
+        generator = self.PoemGenerator(pattern, store=self.candidate_index, stats=self.stats)
+        try:
+            chhondo, _ = generator.determine_chhondo(pattern)
+            poem = await asyncio.get_running_loop().run_in_executor(None, generator.generate_random_poem, lines, match_last)
+        except Exception as e:  # PoemGenerator raises plain Exception for bad patterns / missing words
+            raise HTTPError(400, str(e))
+        return {"pattern": pattern, "chhondo": chhondo, "poem": poem}
+
+    # ---- HTTP/1.1 with keep-alive, enough for a local backend
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self.respond(writer, 400, {"error": "invalid Content-Length"}, keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, {"error": "request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.dispatch(method, target, body)
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> tuple[int, object]:
+        url = urlsplit(target)
+        handler = self.routes.get(url.path)
+        if handler is None:
+            return 404, {"error": f"no endpoint {url.path}"}
+        if method not in ("GET", "POST"):
+            return 405, {"error": f"{method} not allowed"}
+
+        params: dict = dict(parse_qsl(url.query))
+        if body:
+            try:
+                body_json = json.loads(body)
+            except ValueError:
+                body_json = None
+            if not isinstance(body_json, dict):
+                return 400, {"error": "body must be a JSON object"}
+            params.update(body_json)
+        try:
+            return 200, await handler(params)
+        except HTTPError as e:
+            return e.status, {"error": e.message}
+        except Exception as e:
+            # eg a worker process died (BrokenProcessPool) or the POS model failed: answer, keep the connection usable
+            print(f"{method} {url.path} failed: {e!r}", file=sys.stderr)
+            return 500, {"error": f"internal error: {type(e).__name__}"}
+
+    async def respond(self, writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool = True) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+
+    def __repr__(self):
+        return f"<SyllableService> {self.workers} workers, POS {'on' if self.pos_batcher else 'off'}"
+
+
+async def serve(host: str, port: int, service: SyllableService) -> None:
+    start = time.perf_counter()
+    await service.start()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"{service} ready in {time.perf_counter() - start:.2f}s on http://{host}:{port}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="local HTTP service for bangla syllables, matras, POS & poems")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="syllabification processes")
+    parser.add_argument("--no-pos", action="store_true", help="do not load the POS model, /pos answers 503")
+    parser.add_argument("--pos-cache", default=None, help="SQLite file caching POS tags between runs")
+    parser.add_argument("--database", default=DATABASE_FILE, help="words.json used by /poem")
+    args = parser.parse_args()
+
+    service = SyllableService(args.workers, pos=not args.no_pos, pos_cache_path=args.pos_cache, database_path=args.database)
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from word_to_syllables.splitBanglaSyllables import SplitBanglaSyllables
+
+splitter = SplitBanglaSyllables(syllables_only=True)
+
+
+@pytest.mark.parametrize("word, syllables", [
+    ("বিশ্ববিদ্যালয়", ["বিশ্", "ববিদ্", "যাল্", "য়"]),
+    ("রবীন্দ্রনাথ", ["রবীন্", "দ্রনা", "থ্"]),
+    # a conjunct right after a closed syllable extends it instead of making a syllable of its own
+    ("শ্রাবস্তীর", ["শ্রাবস্", "তীর্"]),
+    ("অগ্রগতি", ["অগ্র্", "গতি"]),
+    ("অনুপস্থিত", ["অ", "নুপস্", "থিত্"]),
+    # a conjunct at the end keeps its own syllable
+    ("শাস্ত্র", ["শাস্", "ত্র্"]),
+])
+def test_conjunct_splits(word, syllables):
+    assert splitter.split_word_into_syllables(word) == (word, syllables)
+
+
+@pytest.mark.parametrize("word, matras", [
+    ("শ্রাবস্তীর", {"স্বরবৃত্ত": 2, "মাত্রাবৃত্ত": 4, "অক্ষরবৃত্ত": 3}),
+    ("অগ্রগতি", {"স্বরবৃত্ত": 2, "মাত্রাবৃত্ত": 3, "অক্ষরবৃত্ত": 2}),
+])
+def test_conjunct_matras(word, matras):
+    _, syllables = splitter.split_word_into_syllables(word)
+    assert splitter.get_all_matras(syllables) == matras
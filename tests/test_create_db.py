@@ -0,0 +1,93 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.create_db import create_word_database
+from database.word_lines import iter_word_lines
+from database.word_store import WordStore
+from word_to_syllables.splitBanglaSyllables import SplitBanglaSyllables
+
+CORPUS = "আমার কলম আমার বেদীকে"  # no separator after the last word
+
+
+def build(tmp_path, monkeypatch, **kwargs):
+    # the POS model is not what is tested here
+    monkeypatch.setattr(SplitBanglaSyllables, "get_parts_of_speech_batch", lambda self, words, batch_size=64: ["NOUN"] * len(words))
+    monkeypatch.chdir(tmp_path)
+    create_word_database(workers=1, pos_cache_file=None, **kwargs)
+
+
+def write_corpus(tmp_path, text):
+    (tmp_path / "database").mkdir(exist_ok=True)
+    (tmp_path / "database" / "passage.txt").write_text(text, encoding="utf-8")
+
+
+def stored_frequencies(tmp_path) -> dict[str, int]:
+    store = WordStore(str(tmp_path / "database" / "db" / "words.sqlite"))
+    try:
+        return {entry["word"]: entry["frequency"] for entry in store.entries()}
+    finally:
+        store.close()
+
+
+def test_full_build_stores_the_last_word_without_trailing_newline(tmp_path, monkeypatch):
+    write_corpus(tmp_path, CORPUS)
+    build(tmp_path, monkeypatch)
+
+    assert stored_frequencies(tmp_path) == {"আমার": 2, "কলম": 1, "বেদীকে": 1}
+    lines = {entry["word"] for entry in iter_word_lines(str(tmp_path / "database" / "db" / "words.jsonl"))}
+    assert lines == {"আমার", "কলম", "বেদীকে"}
+
+
+def test_incremental_builds_count_every_word_once(tmp_path, monkeypatch):
+    write_corpus(tmp_path, CORPUS)
+    build(tmp_path, monkeypatch)
+    build(tmp_path, monkeypatch, incremental=True)
+    assert stored_frequencies(tmp_path) == {"আমার": 2, "কলম": 1, "বেদীকে": 1}
+
+    with open(tmp_path / "database" / "passage.txt", "a", encoding="utf-8") as f:
+        f.write(" কলম নতুন")
+    build(tmp_path, monkeypatch, incremental=True)
+    # "নতুন" may still grow, it waits for the next separator
+    assert stored_frequencies(tmp_path) == {"আমার": 2, "কলম": 2, "বেদীকে": 1}
+
+    with open(tmp_path / "database" / "passage.txt", "a", encoding="utf-8") as f:
+        f.write("\n")
+    build(tmp_path, monkeypatch, incremental=True)
+    assert stored_frequencies(tmp_path) == {"আমার": 2, "কলম": 2, "বেদীকে": 1, "নতুন": 1}
+
+
+def test_failed_build_keeps_the_previous_exports(tmp_path, monkeypatch):
+    write_corpus(tmp_path, CORPUS)
+    build(tmp_path, monkeypatch)
+    lines_path = tmp_path / "database" / "db" / "words.jsonl"
+    before = lines_path.read_bytes()
+
+    def fail(self, words, batch_size=64):
+        raise RuntimeError("POS model failed")
+
+    write_corpus(tmp_path, CORPUS + " নতুন\n")
+    monkeypatch.setattr(SplitBanglaSyllables, "get_parts_of_speech_batch", fail)
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(RuntimeError):
+        create_word_database(workers=1, pos_cache_file=None)
+
+    assert lines_path.read_bytes() == before
+    assert not os.path.exists(f"{lines_path}.tmp")
+
+
+def test_corpus_stats_are_committed_with_the_words(tmp_path, monkeypatch):
+    write_corpus(tmp_path, CORPUS)
+    build(tmp_path, monkeypatch)
+    with open(tmp_path / "database" / "passage.txt", "a", encoding="utf-8") as f:
+        f.write(" কলম নতুন\n")
+    build(tmp_path, monkeypatch, incremental=True)
+
+    store = WordStore(str(tmp_path / "database" / "db" / "words.sqlite"), read_only=True)
+    try:
+        stats = store.corpus_stats
+    finally:
+        store.close()
+    assert (stats["words"], stats["tokens"]) == (4, 6)
@@ -0,0 +1,32 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.word_store import WordStore
+
+ENTRY = {"word": "কলম", "syllables": ["ক", "লম্"], "totalMatra": {"স্বরবৃত্ত": 2, "মাত্রাবৃত্ত": 3, "অক্ষরবৃত্ত": 3}, "POS": "NOUN", "frequency": 2}
+
+
+def test_read_only_store_reads_but_never_writes(tmp_path):
+    path = str(tmp_path / "words.sqlite")
+    store = WordStore(path)
+    store.write_words([ENTRY], meta={"corpus_stats": {"words": 1}})
+    store.close()
+    before = os.path.getmtime(path)
+
+    reader = WordStore(path, read_only=True)
+    assert reader.get("কলম") == ENTRY
+    assert reader.corpus_stats == {"words": 1}
+    with pytest.raises(sqlite3.OperationalError):
+        reader.commit({"corpus_stats": {}})
+    reader.close()
+    assert os.path.getmtime(path) == before
+
+
+def test_read_only_store_does_not_create_a_database(tmp_path):
+    with pytest.raises(sqlite3.OperationalError):
+        WordStore(str(tmp_path / "missing" / "words.sqlite"), read_only=True)
+    assert not (tmp_path / "missing").exists()
@@ -0,0 +1,182 @@
+''' // speed & agreement of the four syllabifiers
+
+    SplitBanglaSyllables.split_word_into_syllables   (main)
+    t1.syllabify_bangla
+    t2.split_word_into_syllabi
+    t3.split_word_into_syllabi
+
+    over the words of database/passage.txt and the test words of splitBanglaSyllables.py's __main__,
+    reports words/sec, p50/p99 per-word latency, peak memory & a disagreement matrix with example words
+
+    run from the repo root:  python word_to_syllables/benchmark.py [--limit N]
+'''
+
+import argparse
+import ast
+import gc
+import os
+import signal
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from word_to_syllables.splitBanglaSyllables import SplitBanglaSyllables
+
+WORD_TO_SYLLABLES_DIR = os.path.dirname(os.path.abspath(__file__))
+PASSAGE_FILE = os.path.join(WORD_TO_SYLLABLES_DIR, '..', 'database', 'passage.txt')
+
+
+def load_definitions(filename: str) -> dict:
+    """
+    namespace of a scratch script in this folder (t1/t2/t3) with only its imports,
+    definitions & assignments executed; their module level tests print, and t3's
+    never finishes (its splitter loops forever on a decomposed য়)
+    """
+    path = os.path.join(WORD_TO_SYLLABLES_DIR, filename)
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    kept = (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef, ast.Assign, ast.AnnAssign)
+    tree.body = [node for node in tree.body if isinstance(node, kept)]
+    namespace: dict = {"__name__": filename.removesuffix(".py")}
+    exec(compile(tree, path, "exec"), namespace)
+    return namespace
+
+
+def load_syllabifiers() -> dict[str, Callable[[str], list[str]]]:
+    """name -> function(word) returning the syllables as a list"""
+    t1 = load_definitions("t1.py")
+    t2 = load_definitions("t2.py")
+    t3 = load_definitions("t3.py")
+
+    splitter = SplitBanglaSyllables(syllables_only=True)
+    return {
+        "main": lambda word: splitter.split_word_into_syllables(word)[1],
+        "t1": lambda word: t1["syllabify_bangla"](word).split("-"),  # t1 returns "a-b-c"
+        "t2": t2["split_word_into_syllabi"],
+        "t3": t3["split_word_into_syllabi"],
+    }
+
+
+class SplitTimeout(Exception):
+    pass
+
+
+def on_split_timeout(signum, frame):
+    raise SplitTimeout()
+
+
+def guarded_split(func: Callable[[str], list[str]], word: str, timeout: float = 0.05) -> list[str] | None:
+    """syllables, or None if the splitter raised or got stuck (t3 loops forever on eg a leading "া")"""
+    previous = signal.signal(signal.SIGALRM, on_split_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return func(word)
+    except Exception:
+        return None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def load_test_words() -> list[str]:
+    """the `bangla_words` list of splitBanglaSyllables.py's __main__ block, without running it"""
+    with open(os.path.join(WORD_TO_SYLLABLES_DIR, "splitBanglaSyllables.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.AnnAssign) and getattr(node.target, "id", None) == "bangla_words":
+            return ast.literal_eval(node.value)
+    raise RuntimeError("`bangla_words` not found in splitBanglaSyllables.py")
+
+
+def load_passage_words(path: str = PASSAGE_FILE, limit: int | None = None) -> list[str]:
+    words = SplitBanglaSyllables(syllables_only=True).iter_words(path)
+    return [word for _, word in zip(range(limit), words)] if limit else list(words)
+
+
+def percentile(sorted_values: list[int], fraction: float) -> int:
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def measure(func: Callable[[str], list[str]], words: list[str]) -> dict:
+    """words/sec, per-word latency percentiles (µs) & peak traced memory (KiB) of one syllabifier"""
+    timer = time.perf_counter_ns
+    latencies: list[int] = []
+    gc.collect()
+    gc.disable()
+    try:
+        start = timer()
+        for word in words:
+            word_start = timer()
+            func(word)
+            latencies.append(timer() - word_start)
+        total = timer() - start
+    finally:
+        gc.enable()
+
+    # memory in a separate pass, tracemalloc would distort the timings
+    tracemalloc.start()
+    results = [func(word) for word in words]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+
+    latencies.sort()
+    return {
+        "words_per_sec": len(words) / (total / 1e9) if total else 0.0,
+        "p50_us": percentile(latencies, 0.50) / 1e3,
+        "p99_us": percentile(latencies, 0.99) / 1e3,
+        "peak_kib": peak / 1024,
+    }
+
+
+def split_all(syllabifiers: dict[str, Callable[[str], list[str]]], words: list[str]) -> dict[str, list[list[str] | None]]:
+    """guarded output of every syllabifier for every word (None = failed on that word)"""
+    return {name: [guarded_split(func, word) for word in words] for name, func in syllabifiers.items()}
+
+
+def disagreement_matrix(outputs: dict[str, list[list[str] | None]], words: list[str], examples: int = 3):
+    """for every pair of syllabifiers: (number of words split differently, a few example words)"""
+    names = list(outputs)
+    matrix: dict[tuple[str, str], tuple[int, list[str]]] = {}
+    for i, first in enumerate(names):
+        for second in names[i + 1:]:
+            differing = [word for word, a, b in zip(words, outputs[first], outputs[second]) if a != b]
+            matrix[(first, second)] = (len(differing), differing[:examples])
+    return matrix
+
+
+def report(title: str, words: list[str], syllabifiers: dict[str, Callable[[str], list[str]]]) -> None:
+    unique_words = list(dict.fromkeys(words))
+    outputs = split_all(syllabifiers, unique_words)
+    failed = {word for results in outputs.values() for word, result in zip(unique_words, results) if result is None}
+    # time every splitter over the same words, the ones none of them fails on
+    timed_words = [word for word in words if word not in failed]
+
+    print(f"\n{title}: {len(words)} words ({len(unique_words)} unique)\n" + "+" * 60)
+    print(f"{'splitter':<8} {'words/sec':>12} {'p50 µs':>9} {'p99 µs':>9} {'peak KiB':>10} {'failed':>7}")
+    for name, func in syllabifiers.items():
+        stats = measure(func, timed_words)
+        failures = sum(result is None for result in outputs[name])
+        print(f"{name:<8} {stats['words_per_sec']:>12,.0f} {stats['p50_us']:>9.2f} {stats['p99_us']:>9.2f} {stats['peak_kib']:>10,.0f} {failures:>7}")
+
+    print(f"\ndisagreements over {len(unique_words)} unique words (a failed split counts as a disagreement)")
+    for (first, second), (count, example_words) in disagreement_matrix(outputs, unique_words).items():
+        print(f"{first:>4} vs {second:<4} {count:>7} ({count / len(unique_words):6.1%})  eg: {', '.join(example_words)}")
+        for word in example_words[:1]:
+            index = unique_words.index(word)
+            print(f"{'':16}{word}: {first}={outputs[first][index]} {second}={outputs[second][index]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark & compare the bangla syllabifiers")
+    parser.add_argument("--limit", type=int, default=None, help="only use the first N words of passage.txt")
+    args = parser.parse_args()
+
+    syllabifiers = load_syllabifiers()
+    report("splitBanglaSyllables.py test words", load_test_words(), syllabifiers)
+    report("database/passage.txt", load_passage_words(limit=args.limit), syllabifiers)
@@ -0,0 +1,156 @@
+''' // infer the chhondo & pattern (4n+2, 6n+2, 8|6 ...) of existing poems
+
+    the reverse of PoemGenerator.determine_chhondo: every line is syllabified, every word gets its matra in
+    all three chhondos, and each (chhondo, parba size p) hypothesis is scored for all lines of all poems at once:
+        alignment -> share of the parba boundaries (p, 2p, ...) inside a line that fall on a word boundary
+        tail      -> share of lines whose last, shorter parba (total % p) is the poem's most common one
+        count     -> share of lines with the poem's most common number of full parbas (total // p)
+    score = mean of the three, the best hypothesis gives the chhondo & the pattern (eg 4|4|4|2, 4n+2)
+
+    batch job over raw scraped poems (scraper1/2 format, `=== poet — title ===` headers):
+        python word_to_syllables/chhondo_analyzer.py [path]
+'''
+
+import os
+import re
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from word_to_syllables.splitBanglaSyllables import SplitBanglaSyllables
+
+poem_header_pattern = re.compile(r"^===\s*(.*?)\s*===\s*$")
+
+
+def iter_scraped_poems(path: str):
+    """yields (title, text) of every poem in a file written by the scrapers"""
+    title, lines = None, []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            header = poem_header_pattern.match(line)
+            if header:
+                if title is not None or any(l.strip() for l in lines):
+                    yield title, "".join(lines)
+                title, lines = header.group(1), []
+            else:
+                lines.append(line)
+    if title is not None or any(l.strip() for l in lines):
+        yield title, "".join(lines)
+
+
+class ChhondoAnalyzer:
+    # parba sizes tried for each chhondo, same ranges as PoemGenerator.determine_chhondo
+    candidate_parbas: dict[str, tuple[int, ...]] = {
+        "স্বরবৃত্ত": (4,),
+        "মাত্রাবৃত্ত": (5, 6, 7),
+        "অক্ষরবৃত্ত": (8, 10),
+    }
+
+    def __init__(self, splitter: SplitBanglaSyllables | None = None):
+        self.splitter = splitter or SplitBanglaSyllables(syllables_only=True, syllable_cache_size=1 << 15)
+        self.hypotheses: list[tuple[str, int]] = [
+            (chhondo, parba) for chhondo, parbas in self.candidate_parbas.items() for parba in parbas
+        ]
+
+    def word_matras(self, poems: list[str]):
+        """
+        flat per-word matra arrays of all non-empty lines of all poems
+        :return: (matras (n_words, 3), line of each word, poem of each line)
+        """
+        syllables: list[list[str]] = []
+        word_line: list[int] = []
+        line_poem: list[int] = []
+        for poem_index, poem in enumerate(poems):
+            for line in poem.split("\n"):
+                words = [sylls for _, sylls in self.splitter.iter_syllables([line])]
+                if not words:
+                    continue
+                word_line.extend([len(line_poem)] * len(words))
+                line_poem.append(poem_index)
+                syllables.extend(words)
+
+        matras = self.splitter.get_all_matras_batch(syllables)
+        return matras, np.asarray(word_line, dtype=np.int64), np.asarray(line_poem, dtype=np.int64)
+
+    def analyze_many(self, poems: list[str]) -> list[dict]:
+        """best chhondo & pattern of every poem, see module doc for the scoring"""
+        matras, word_line, line_poem = self.word_matras(poems)
+        n_lines, n_poems = len(line_poem), len(poems)
+        results: list[dict] = [{"chhondo": None, "pattern": None, "formula": None, "score": 0.0, "scores": {}} for _ in poems]
+        if not n_lines:
+            return results
+
+        # matra running total at the end of every word, restarted on every line
+        running = np.cumsum(matras, axis=0)
+        line_first_word = np.searchsorted(word_line, np.arange(n_lines))
+        before_line = np.vstack([np.zeros((1, 3), dtype=running.dtype), running])[line_first_word]
+        within_line = running - before_line[word_line]
+        line_totals = np.zeros((n_lines, 3), dtype=np.int64)
+        np.add.at(line_totals, word_line, matras)
+        lines_per_poem = np.bincount(line_poem, minlength=n_poems)
+
+        scores = np.zeros((len(self.hypotheses), n_poems))
+        modal = np.zeros((len(self.hypotheses), n_poems, 2), dtype=np.int64)
+        for h, (chhondo, parba) in enumerate(self.hypotheses):
+            column = self.splitter.chhondos.index(chhondo)
+            totals = line_totals[:, column]
+            full, tail = totals // parba, totals % parba
+
+            # parba boundaries inside the line that land on a word end
+            ends = within_line[:, column]
+            hit = (matras[:, column] > 0) & (ends % parba == 0) & (ends < totals[word_line])
+            hits = np.bincount(word_line[hit], minlength=n_lines)
+            needed = full - (tail == 0)
+            alignment = np.where(needed > 0, hits / np.maximum(needed, 1), (full > 0).astype(float))
+
+            # the most common tail & parba count of each poem
+            tail_counts = np.zeros((n_poems, parba), dtype=np.int64)
+            np.add.at(tail_counts, (line_poem, tail), 1)
+            modal_tail = tail_counts.argmax(axis=1)
+            full_counts = np.zeros((n_poems, int(full.max()) + 1), dtype=np.int64)
+            np.add.at(full_counts, (line_poem, full), 1)
+            modal_full = full_counts.argmax(axis=1)
+
+            line_score = (alignment + (tail == modal_tail[line_poem]) + (full == modal_full[line_poem])) / 3
+            scores[h] = np.bincount(line_poem, weights=line_score, minlength=n_poems) / np.maximum(lines_per_poem, 1)
+            modal[h, :, 0], modal[h, :, 1] = modal_full, modal_tail
+
+        best = scores.argmax(axis=0)
+        for poem_index in np.flatnonzero(lines_per_poem):
+            h = best[poem_index]
+            chhondo, parba = self.hypotheses[h]
+            full, tail = modal[h, poem_index]
+            pattern = [parba] * int(full) + ([int(tail)] if tail else [])
+            results[poem_index] = {
+                "chhondo": chhondo,
+                "pattern": "|".join(map(str, pattern)),
+                "formula": f"{parba}n+{tail}" if tail else f"{parba}n",
+                "score": float(scores[h, poem_index]),
+                "scores": {f"{c} {p}": float(scores[i, poem_index]) for i, (c, p) in enumerate(self.hypotheses)},
+            }
+        return results
+
+    def analyze(self, poem: str) -> dict:
+        return self.analyze_many([poem])[0]
+
+    def __repr__(self):
+        return "<ChhondoAnalyzer> Detect chhondo & pattern of bangla poems"
+
+
+if __name__ == "__main__":
+    import time
+
+    analyzer = ChhondoAnalyzer()
+    if len(sys.argv) > 1:
+        start = time.perf_counter()
+        titles, poems = zip(*iter_scraped_poems(sys.argv[1])) if os.path.getsize(sys.argv[1]) else ((), ())
+        for title, result in zip(titles, analyzer.analyze_many(list(poems))):
+            print(f"{title}\t{result['chhondo']}\t{result['pattern']}\t{result['formula']}\t{result['score']:.2f}")
+        print(f"{len(poems)} poems in {time.perf_counter() - start:.2f}s")
+    else:
+        poem = """হাজার বছর ধরে আমি পথ হাঁটিতেছি পৃথিবীর পথে,
+                সিংহল সমুদ্র থেকে নিশীথের অন্ধকারে মালয় সাগরে
+                অনেক ঘুরেছি আমি; বিম্বিসার অশোকের ধূসর জগতে
+                সেখানে ছিলাম আমি; আরো দূর অন্ধকারে বিদর্ভ নগরে;"""
+        print(analyzer.analyze(poem))
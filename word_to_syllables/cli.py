@@ -0,0 +1,73 @@
+''' // command line syllabification & matra counting, for shell pipelines
+
+    reads the files given (or stdin, also as "-") & writes one JSON object per word to stdout:
+        {"word": ..., "syllables": [...], "matras": {chhondo: matra, ...}}            (+ "pos" with --pos)
+
+    the POS model is only loaded with --pos, so without it the tool starts in well under a second
+
+    python word_to_syllables/cli.py poems.txt --workers 4 > words.jsonl
+    cat dump.txt | python word_to_syllables/cli.py --pos --pos-cache db/pos_cache.sqlite | jq .
+'''
+
+import argparse
+import json
+import os
+import sys
+from itertools import islice
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from word_to_syllables.parallel_split import split_corpus_parallel
+from word_to_syllables.splitBanglaSyllables import SplitBanglaSyllables
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="split bangla text into syllables & matras, one JSON line per word")
+    parser.add_argument("files", nargs="*", default=["-"], help="utf-8 text files, - or nothing for stdin")
+    parser.add_argument("--workers", type=int, default=1, help="processes used for syllabification (default 1)")
+    parser.add_argument("--chunk-words", type=int, default=5000, help="words per task sent to a worker")
+    parser.add_argument("--pos", action="store_true", help="add the part of speech of every word (loads the POS model)")
+    parser.add_argument("--pos-cache", default=None, help="SQLite file caching POS tags between runs")
+    parser.add_argument("--batch-size", type=int, default=64, help="words per POS model call")
+    return parser.parse_args(argv)
+
+
+def iter_records(source, splitter: SplitBanglaSyllables, workers: int = 1, chunk_words: int = 5000, pos: bool = False, batch_size: int = 64):
+    """yields the output dict of every word of `source` (a path, a text file object or an iterable of lines)"""
+    words = split_corpus_parallel(source, workers=workers, chunk_words=chunk_words)
+    # POS tags are inferred for a chunk of words at a time, so the model gets full batches
+    while chunk := list(islice(words, chunk_words)):
+        tags = splitter.get_parts_of_speech_batch([word for word, _ in chunk], batch_size=batch_size) if pos else None
+        matras = splitter.get_all_matras_batch([syllables for _, syllables in chunk])
+        for index, (word, syllables) in enumerate(chunk):
+            record = {"word": word, "syllables": syllables, "matras": dict(zip(splitter.chhondos, matras[index].tolist()))}
+            if tags is not None:
+                record["pos"] = tags[index]
+            yield record
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.workers < 1:
+        print("--workers must be at least 1", file=sys.stderr)
+        return 2
+
+    splitter = SplitBanglaSyllables(syllables_only=not args.pos, pos_cache_path=args.pos_cache)
+    out = sys.stdout
+    try:
+        for name in args.files:
+            source = sys.stdin if name == "-" else name
+            for record in iter_records(source, splitter, args.workers, args.chunk_words, args.pos, args.batch_size):
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+    except BrokenPipeError:
+        # the reader (eg `head`) went away, stop quietly
+        sys.stdout = None
+        return 0
+    except FileNotFoundError as e:
+        print(f"no such file: {e.filename}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
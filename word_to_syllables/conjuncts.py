@@ -0,0 +1,53 @@
+''' // juktakkhor (conjunct) table for the splitter
+
+    every consonant + hosonto + consonant (+ hosonto + consonant ...) sequence seen in the corpus,
+    one per line in conjuncts.txt, loaded once by SplitBanglaSyllables for its longest-match scan
+
+    rebuild after the corpus grows, from the repo root:  python word_to_syllables/conjuncts.py
+'''
+
+import os
+import re
+import sys
+from collections import Counter
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from word_to_syllables.normalize import normalize_text
+
+CONJUNCT_TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "conjuncts.txt")
+
+# same consonant set as SplitBanglaSyllables.bangla_consonants
+consonants = "কখগঘঙচছজঝঞটঠডঢণতথদধনপফবভমযরলশষসহড়ঢ়য়"
+conjunct_pattern = re.compile(f"[{consonants}](?:্[{consonants}])+")
+
+
+def find_conjuncts(text: str) -> Counter:
+    """count of every maximal C্C(্C...) sequence in the (normalized) text"""
+    return Counter(conjunct_pattern.findall(normalize_text(text)))
+
+
+def build_conjunct_table(corpus_file: str, table_file: str = CONJUNCT_TABLE_FILE, min_count: int = 1) -> list[str]:
+    """collect the conjuncts of `corpus_file` seen at least `min_count` times & write them to `table_file`"""
+    counts: Counter = Counter()
+    with open(corpus_file, "r", encoding="utf-8") as f:
+        for line in f:
+            counts.update(find_conjuncts(line))
+
+    conjuncts = sorted(conjunct for conjunct, count in counts.items() if count >= min_count)
+    with open(table_file, "w", encoding="utf-8") as f:
+        f.write("\n".join(conjuncts) + "\n")
+    return conjuncts
+
+
+def load_conjunct_table(table_file: str = CONJUNCT_TABLE_FILE) -> frozenset[str]:
+    """the saved conjunct table, empty if it was never built"""
+    if not os.path.exists(table_file):
+        return frozenset()
+    with open(table_file, "r", encoding="utf-8") as f:
+        return frozenset(line.strip() for line in f if line.strip())
+
+
+if __name__ == "__main__":
+    corpus = os.path.join(os.getcwd(), "database", "passage.txt")
+    conjuncts = build_conjunct_table(corpus)
+    print(f"{len(conjuncts)} conjuncts written to {CONJUNCT_TABLE_FILE}")
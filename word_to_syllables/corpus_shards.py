@@ -0,0 +1,157 @@
+''' // byte-range shards of a corpus file, for jobs that read passage.txt on every core
+
+    the file is memory-mapped once & cut into ~equal byte ranges; each cut is moved forward to just
+    after an ascii whitespace byte (or a newline, align="line"), so
+        - no word & no utf-8 sequence is ever split (utf-8 never uses ascii bytes inside a multi-byte char)
+        - normalize_text gives the same result per shard as for the whole file (nothing composes across whitespace)
+    a Shard is only (path, start, end), cheap to send to a worker process, which maps the file itself
+    & decodes its own range straight from the page cache
+
+    shared by parallel_split.py (syllabification, word counting), create_db.py & sanitise_passage.py
+'''
+
+import mmap
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import NamedTuple
+
+# upper bound of a shard, a worker holds one decoded shard (+ its results) at a time
+SHARD_BYTES = 1 << 22
+
+separator_patterns = {
+    "space": re.compile(rb"[ \t\r\n]"),
+    "line": re.compile(rb"\n"),
+}
+
+
+class Shard(NamedTuple):
+    path: str
+    start: int
+    end: int
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+
+def open_map(path: str) -> mmap.mmap | None:
+    """read only map of the file, None for an empty file (mmap refuses length 0)"""
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_shard(shard: Shard) -> str:
+    """the text of `shard`, decoded without copying the bytes out of the map first; runs in a worker"""
+    if not len(shard):
+        return ""
+    buffer = open_map(shard.path)
+    try:
+        with memoryview(buffer) as view:
+            return str(view[shard.start:shard.end], "utf-8")
+    finally:
+        buffer.close()
+
+
+def shard_boundaries(buffer, shards: int, start: int = 0, end: int | None = None, align: str = "space") -> list[tuple[int, int]]:
+    """
+    (start, end) byte ranges covering buffer[start:end], at most `shards` of them, every
+    range but the last ending just after a separator; ranges are dropped, never split,
+    when no separator follows their target cut
+    """
+    if align not in separator_patterns:
+        raise ValueError(f"unknown align {align!r}, expected one of {list(separator_patterns)}")
+    if shards < 1:
+        raise ValueError("`shards` must be at least 1.")
+    end = len(buffer) if end is None else end
+    separator = separator_patterns[align]
+
+    ranges = []
+    position = start
+    for index in range(1, shards):
+        target = start + (end - start) * index // shards
+        if target <= position:
+            continue
+        found = separator.search(buffer, target, end)
+        if found is None:
+            break
+        ranges.append((position, found.end()))
+        position = found.end()
+    if position < end or not ranges:
+        ranges.append((position, end))
+    return ranges
+
+
+class CorpusShards:
+    """
+    :param path: utf-8 text file
+    :param shards: number of shards, at least enough that none is over `shard_bytes`
+    :param start, end: byte range of the file to shard (eg the text appended since the last build)
+    :param align: "space" cuts after any ascii whitespace, "line" only after a newline
+    """
+
+    def __init__(self, path: str, shards: int = 1, start: int = 0, end: int | None = None, align: str = "space", shard_bytes: int = SHARD_BYTES):
+        self.path = os.path.abspath(path)
+        self.size = os.path.getsize(self.path)
+        end = self.size if end is None else min(end, self.size)
+        if not 0 <= start <= end:
+            raise ValueError(f"bad byte range {start}..{end} of a {self.size} byte file")
+
+        count = max(shards, -(-(end - start) // shard_bytes), 1)
+        buffer = open_map(self.path)
+        if buffer is None:
+            ranges = [(0, 0)]
+        else:
+            try:
+                ranges = shard_boundaries(buffer, count, start, end, align)
+            finally:
+                buffer.close()
+        self.shards = [Shard(self.path, shard_start, shard_end) for shard_start, shard_end in ranges]
+
+    def map(self, fn, workers: int = 1, initializer=None, initargs=()):
+        """
+        yields fn(shard) for every shard, in file order; with `workers` > 1 in a process pool
+        (fn & initializer must then be module level functions), at most 2 shards per worker in flight
+        """
+        if workers < 1:
+            raise ValueError("`workers` must be at least 1.")
+        if workers == 1 or len(self.shards) == 1:
+            if initializer is not None:
+                initializer(*initargs)
+            for shard in self.shards:
+                yield fn(shard)
+            return
+
+        shards = iter(self.shards)
+        with ProcessPoolExecutor(max_workers=min(workers, len(self.shards)), initializer=initializer, initargs=initargs) as pool:
+            in_flight = deque(pool.submit(fn, shard) for shard in islice(shards, 2 * workers))
+            while in_flight:
+                result = in_flight.popleft().result()
+                shard = next(shards, None)
+                if shard is not None:
+                    in_flight.append(pool.submit(fn, shard))
+                yield result
+
+    def __iter__(self):
+        return iter(self.shards)
+
+    def __len__(self) -> int:
+        return len(self.shards)
+
+    def __repr__(self):
+        return f"<CorpusShards> {self.path} {len(self.shards)} shards of {self.size} bytes"
+
+
+if __name__ == "__main__":
+    import time
+
+    corpus = os.path.join(os.getcwd(), "database", "passage.txt")
+    start = time.perf_counter()
+    shards = CorpusShards(corpus, shards=os.cpu_count() or 1)
+    print(f"{shards} planned in {(time.perf_counter() - start) * 1e3:.2f} ms")
+    for shard in shards:
+        text = read_shard(shard)
+        print(f"{shard.start:>10}..{shard.end:<10} {len(text):>9} chars  {text[:20]!r} ... {text[-20:]!r}")
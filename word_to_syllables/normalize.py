@@ -0,0 +1,37 @@
+''' // ingest time normalization of bangla text, run once per text before splitting
+
+    the same letter can come in two code-point spellings, eg য় is either U+09DF or U+09AF U+09BC (য + nukta),
+    and ো either U+09CB or U+09C7 U+09BE; the splitter's consonant table only knows the single code-point
+    forms, so without this the same word gets split (and stored) two different ways
+
+    1. drop invisible formatting chars (ZWJ, ZWNJ, soft hyphen, BOM)      -- str.translate table
+    2. unicode NFC, composes the two part vowel signs (ো, ৌ)
+    3. fold consonant + nukta back to the single code-point ড় ঢ় য়         -- NFC decomposes these three
+'''
+
+import unicodedata
+
+invisible_chars_table: dict[int, None] = str.maketrans("", "", "\u200c\u200d\u00ad\ufeff")
+
+nukta_folds: dict[str, str] = {
+    "\u09a1\u09bc": "\u09dc",  # ড + nukta -> ড়
+    "\u09a2\u09bc": "\u09dd",  # ঢ + nukta -> ঢ়
+    "\u09af\u09bc": "\u09df",  # য + nukta -> য়
+}
+
+
+def normalize_text(text: str) -> str:
+    """one canonical code-point spelling for bangla text, see module doc"""
+    if not text:
+        return text
+
+    text = unicodedata.normalize("NFC", text.translate(invisible_chars_table))
+    if "\u09bc" in text:
+        for decomposed, composed in nukta_folds.items():
+            text = text.replace(decomposed, composed)
+    return text
+
+
+if __name__ == "__main__":
+    for word in ["য়", "য়", "কোন", "র‍্য"]:
+        print(f"{word} {[hex(ord(ch)) for ch in word]} -> {[hex(ord(ch)) for ch in normalize_text(word)]}")
@@ -0,0 +1,122 @@
+''' // multi-process syllabification of a whole corpus
+
+    parent: a corpus file is cut into byte-range shards (corpus_shards.py) that the workers read themselves,
+            any other source is streamed (SplitBanglaSyllables.iter_words) & cut into chunks of words
+    workers: one rule-only splitter each (syllables_only=True, the POS model is never loaded)
+    results are yielded back in the original word order
+'''
+
+import os
+import sys
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from word_to_syllables.corpus_shards import CorpusShards, Shard, read_shard
+from word_to_syllables.splitBanglaSyllables import SplitBanglaSyllables
+
+# the splitter of a worker process, built once by `init_worker`
+worker_splitter: SplitBanglaSyllables | None = None
+
+
+def init_worker(syllable_cache_size: int) -> None:
+    global worker_splitter
+    worker_splitter = SplitBanglaSyllables(syllables_only=True, syllable_cache_size=syllable_cache_size)
+
+
+def split_words(words: list[str]) -> list[tuple[str, list[str]]]:
+    return [worker_splitter.split_word_into_syllables(word) for word in words]
+
+
+def split_words_with_matras(words: list[str]) -> list[tuple[str, list[str], tuple[int, int, int]]]:
+    """(word, syllables, matras in `chhondos` order) of every word"""
+    results = []
+    for word in words:
+        word, syllables = worker_splitter.split_word_into_syllables(word)
+        results.append((word, syllables, tuple(worker_splitter.get_all_matras(syllables).values())))
+    return results
+
+
+def shard_words(shard: Shard) -> list[str]:
+    return list(worker_splitter.iter_words([read_shard(shard)]))
+
+
+def split_shard(shard: Shard) -> list[tuple[str, list[str]]]:
+    return split_words(shard_words(shard))
+
+
+def count_shard_words(shard: Shard) -> Counter:
+    return Counter(shard_words(shard))
+
+
+def count_corpus_words(path: str, workers: int | None = None, start: int = 0, end: int | None = None) -> Counter:
+    """
+    {word: occurrences} of bytes `start`..`end` of the corpus file (both must be at whitespace, or
+    the file's ends), in first-seen order; the shards are counted in a process pool & merged in file order
+    """
+    workers = workers or os.cpu_count() or 1
+    counts = Counter()
+    for shard_counts in CorpusShards(path, shards=workers, start=start, end=end).map(count_shard_words, workers, init_worker, (0,)):
+        counts.update(shard_counts)
+    return counts
+
+
+def iter_word_chunks(words, chunk_words: int):
+    words = iter(words)
+    while chunk := list(islice(words, chunk_words)):
+        yield chunk
+
+
+def split_corpus_parallel(source, workers: int | None = None, chunk_words: int = 5000, syllable_cache_size: int = 4096):
+    """
+    Yields (word, syllables) for every word of `source`, in order, with the
+    syllabification spread over a process pool.
+
+    The corpus (passage.txt) is usually one long line after sanitising, so the
+    work is cut into byte-range shards of the file (a path), or into chunks of
+    `chunk_words` words (other sources) rather than lines. At most 2 shards /
+    chunks per worker are in flight, so memory stays bounded for any corpus size.
+
+    :param source: path of a utf-8 text file, a text file object, or an iterable of lines
+    :param workers: number of processes (default: os.cpu_count()), 1 runs in-process
+    :param chunk_words: words per task sent to a worker, when `source` is not a path
+    :param syllable_cache_size: LRU size of each worker's splitter
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("`workers` must be at least 1.")
+    if chunk_words < 1:
+        raise ValueError("`chunk_words` must be at least 1.")
+
+    reader = SplitBanglaSyllables(syllables_only=True, syllable_cache_size=syllable_cache_size)
+    if workers == 1:
+        yield from reader.iter_syllables(source)
+        return
+
+    if isinstance(source, (str, os.PathLike)):
+        # the workers read their own byte ranges of the file, the parent never decodes it
+        shards = CorpusShards(os.fspath(source), shards=workers)
+        for result in shards.map(split_shard, workers, init_worker, (syllable_cache_size,)):
+            yield from result
+        return
+
+    chunks = iter_word_chunks(reader.iter_words(source), chunk_words)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(syllable_cache_size,)) as pool:
+        in_flight = deque(pool.submit(split_words, chunk) for chunk in islice(chunks, 2 * workers))
+        while in_flight:
+            result = in_flight.popleft().result()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                in_flight.append(pool.submit(split_words, chunk))
+            yield from result
+
+
+if __name__ == "__main__":
+    import time
+
+    corpus = os.path.join(os.getcwd(), "database", "passage.txt")
+    for workers in (1, os.cpu_count() or 1):
+        start = time.perf_counter()
+        count = sum(1 for _ in split_corpus_parallel(corpus, workers=workers))
+        print(f"{workers=}: {count} words in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,115 @@
+''' // incremental syllables & matra of a poem being edited
+
+    an editor sends edit ranges (line, column) -> only the lines in the range are re-read,
+    and in them only the words that were not there before are re-syllabified;
+    the per-line matra totals of all three chhondos are updated & only the changed lines are returned
+'''
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from word_to_syllables.splitBanglaSyllables import SplitBanglaSyllables
+
+
+class PoemLine:
+    __slots__ = ("text", "words", "totals")
+
+    def __init__(self, text: str, words: list[tuple[str, list[str], tuple[int, int, int]]]):
+        self.text = text
+        self.words = words  # (word, syllables, matras in `SplitBanglaSyllables.chhondos` order)
+        swarabritta = matrabritta = aksharabritta = 0
+        for _, _, (s, m, a) in words:
+            swarabritta += s
+            matrabritta += m
+            aksharabritta += a
+        self.totals: tuple[int, int, int] = (swarabritta, matrabritta, aksharabritta)
+
+    def __repr__(self):
+        return f"<PoemLine> {self.text!r} {self.totals}"
+
+
+class PoemDocument:
+    def __init__(self, text: str = "", splitter: SplitBanglaSyllables | None = None):
+        self.splitter = splitter or SplitBanglaSyllables(syllables_only=True, syllable_cache_size=4096)
+        self.lines: list[PoemLine] = [self.read_line(line, {}) for line in text.split("\n")]
+
+    def read_line(self, text: str, known: dict[str, tuple[list[str], tuple[int, int, int]]]) -> PoemLine:
+        """split a line into words, reusing (syllables, matras) of the words in `known`"""
+        words = []
+        for word in self.splitter.iter_words([text]):
+            if word not in known:
+                _, syllables = self.splitter.split_word_into_syllables(word)
+                known[word] = (syllables, tuple(self.splitter.get_all_matras(syllables).values()))
+            syllables, matras = known[word]
+            words.append((word, syllables, matras))
+        return PoemLine(text, words)
+
+    def edit(self, start_line: int, start_column: int, end_line: int, end_column: int, text: str) -> dict[int, dict[str, int]]:
+        """
+        Replace the text between (start_line, start_column) & (end_line, end_column), both 0 based
+        and the end exclusive, with `text` (which may hold new lines).
+
+        :return: {line number: matra totals per chhondo} of the lines whose text changed;
+                 lines after the edit keep their totals but move by the number of lines added/removed
+        :raises IndexError: if the range is outside the document
+        """
+        if not (0 <= start_line <= end_line < len(self.lines)):
+            raise IndexError(f"edit range lines {start_line}-{end_line} outside the document (0-{len(self.lines) - 1})")
+
+        first, last = self.lines[start_line], self.lines[end_line]
+        if not (0 <= start_column <= len(first.text) and 0 <= end_column <= len(last.text)):
+            raise IndexError("edit range column outside the line")
+        if start_line == end_line and start_column > end_column:
+            raise IndexError("edit range ends before it starts")
+
+        replaced = self.lines[start_line:end_line + 1]
+        known = {word: (syllables, matras) for line in replaced for word, syllables, matras in line.words}
+
+        new_texts = (first.text[:start_column] + text + last.text[end_column:]).split("\n")
+        new_lines = [
+            replaced[index] if index < len(replaced) and replaced[index].text == new_text else self.read_line(new_text, known)
+            for index, new_text in enumerate(new_texts)
+        ]
+        self.lines[start_line:end_line + 1] = new_lines
+
+        return {
+            start_line + index: self.line_matras(start_line + index)
+            for index, line in enumerate(new_lines)
+            if index >= len(replaced) or line is not replaced[index]
+        }
+
+    def line_matras(self, line_number: int) -> dict[str, int]:
+        return dict(zip(self.splitter.chhondos, self.lines[line_number].totals))
+
+    def matras(self) -> list[dict[str, int]]:
+        """matra totals per chhondo of every line"""
+        return [self.line_matras(index) for index in range(len(self.lines))]
+
+    @property
+    def text(self) -> str:
+        return "\n".join(line.text for line in self.lines)
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def __repr__(self):
+        return f"<PoemDocument> {len(self.lines)} lines"
+
+
+if __name__ == "__main__":
+    import time
+
+    poem = """হাজার বছর ধরে আমি পথ হাঁটিতেছি পৃথিবীর পথে,
+সিংহল সমুদ্র থেকে নিশীথের অন্ধকারে মালয় সাগরে
+অনেক ঘুরেছি আমি; বিম্বিসার অশোকের ধূসর জগতে"""
+
+    document = PoemDocument("\n".join([poem] * 20))
+    print(document, document.matras()[:3])
+
+    start = time.perf_counter()
+    changed = document.edit(1, 5, 1, 5, " নীল")
+    print(f"{changed} in {(time.perf_counter() - start) * 1e3:.3f} ms")
+
+    changed = document.edit(0, 0, 2, len(document.lines[2].text), "আমি\nতুমি")
+    print(changed, len(document))
@@ -0,0 +1,121 @@
+''' // word -> POS tag cache, namespaced by model name
+
+    in-memory LRU  ->  sqlite table `pos_tags(model, word, tag)`  ->  (miss: run the model)
+
+    the tag of a word never changes for a fixed model, so a rebuild only has to
+    run inference for words the cache has not seen yet
+'''
+
+import os
+import sqlite3
+from collections import OrderedDict
+
+
+class PosTagCache:
+    # sqlite allows 999 host parameters per statement on older builds
+    query_chunk_size: int = 900
+
+    def __init__(self, path: str, model_name: str, lru_size: int = 4096):
+        if lru_size < 0:
+            raise ValueError("`lru_size` cannot be negative.")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.model_name = model_name
+        self.lru_size = lru_size
+        self.lru: OrderedDict[str, str] = OrderedDict()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS pos_tags (
+                model TEXT NOT NULL,
+                word TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                PRIMARY KEY (model, word)
+            ) WITHOUT ROWID"""
+        )
+        self.conn.commit()
+
+    def remember(self, word: str, tag: str) -> None:
+        """put into the in-memory LRU only"""
+        if not self.lru_size:
+            return
+        self.lru[word] = tag
+        self.lru.move_to_end(word)
+        if len(self.lru) > self.lru_size:
+            self.lru.popitem(last=False)
+
+    def get(self, word: str) -> str | None:
+        """cached tag of `word`, or None if it was never tagged with this model"""
+        return self.get_many([word]).get(word)
+
+    def get_many(self, words) -> dict[str, str]:
+        """cached tags for `words` (each unique word is counted once as hit/miss)"""
+        found: dict[str, str] = {}
+        to_query: list[str] = []
+
+        for word in dict.fromkeys(words):
+            if word in self.lru:
+                self.lru.move_to_end(word)
+                found[word] = self.lru[word]
+                self.memory_hits += 1
+            else:
+                to_query.append(word)
+
+        disk_found = 0
+        for i in range(0, len(to_query), self.query_chunk_size):
+            chunk = to_query[i:i + self.query_chunk_size]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT word, tag FROM pos_tags WHERE model = ? AND word IN ({placeholders})",
+                [self.model_name, *chunk]
+            )
+            for word, tag in rows:
+                found[word] = tag
+                self.remember(word, tag)
+                disk_found += 1
+
+        self.disk_hits += disk_found
+        self.misses += len(to_query) - disk_found
+
+        return found
+
+    def put(self, word: str, tag: str) -> None:
+        self.put_many([(word, tag)])
+
+    def put_many(self, items) -> None:
+        """store (word, tag) pairs on disk and in memory, in one transaction"""
+        items = list(items)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pos_tags (model, word, tag) VALUES (?, ?, ?)",
+                [(self.model_name, word, tag) for word, tag in items]
+            )
+        for word, tag in items:
+            self.remember(word, tag)
+
+    def stats(self) -> dict[str, int]:
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "lru_size": len(self.lru),
+        }
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __len__(self) -> int:
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM pos_tags WHERE model = ?", (self.model_name,)).fetchone()
+        return count
+
+    def __repr__(self):
+        return f"<PosTagCache> {self.model_name} @ {self.path}"
@@ -1,6 +1,18 @@
+import os
 import re
-from transformers import AutoTokenizer, AutoModelForTokenClassification, pipeline
-from transformers.pipelines import AggregationStrategy, PipelineException
+import sys
+from array import array
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from word_to_syllables.conjuncts import load_conjunct_table
+from word_to_syllables.normalize import normalize_text
+from word_to_syllables.pos_cache import PosTagCache
+
+if TYPE_CHECKING:
+    # transformers is heavy, it is imported only when the POS model is first needed
+    from transformers.pipelines import AggregationStrategy
 
 
 class SplitBanglaSyllables:
@@ -30,18 +42,93 @@ class SplitBanglaSyllables:
 
     bangla_vowels_flattened: set[str] = {char for tup in bangla_vowels for char in tup}
 
-    def __init__(self, model_name: str = "mHossain/bengali_pos_v1_300000", aggregation_strategy: AggregationStrategy = "simple"):
+    chhondos: tuple[str, str, str] = ("স্বরবৃত্ত", "মাত্রাবৃত্ত", "অক্ষরবৃত্ত")
+
+    punctuation_pattern: re.Pattern = re.compile(r'[,.।;:]')
+
+    # codepoint classification tables for the single pass splitter, built once
+    # (every consonant/vowel above is a single codepoint, so a per-char lookup
+    # is equivalent to the old `[...]` regex character classes)
+    OTHER, CONSONANT, VOWEL = 0, 1, 2
+    char_class: dict[str, int] = {
+        **dict.fromkeys(bangla_consonants, CONSONANT),
+        **dict.fromkeys(bangla_vowels_flattened - {""}, VOWEL),
+    }
+    symbol_to_letter_table: dict[int, str] = {ord(symbol): letter for letter, symbol in bangla_vowels if symbol}
+
+    # juktakkhor seen in the corpus (conjuncts.txt), matched longest first
+    # CODA: first consonant + hosonto of a conjunct inside a word, it closes the syllable before it
+    CODA = 3
+    conjunct_table: frozenset[str] = load_conjunct_table()
+    conjunct_max_length: int = max(map(len, conjunct_table), default=0)
+
+    def __init__(self, model_name: str = "mHossain/bengali_pos_v1_300000", aggregation_strategy: "AggregationStrategy" = "simple", syllables_only: bool = False, pos_cache_path: str | None = None, syllable_cache_size: int = 0, conjunct_aware: bool = True):
+        """
+        The POS model is not loaded here, only on the first POS request.
+        With `syllables_only=True` the splitter never touches transformers at all
+        (syllables & matra only), and POS requests raise RuntimeError.
+        With `pos_cache_path`, POS tags are looked up in a persistent per-model
+        cache (see PosTagCache) before running the model.
+        With `syllable_cache_size > 0`, split_word_into_syllables & get_matra are
+        memoized in bounded LRU caches of that size, see `cache_info()`.
+        With `conjunct_aware=False` juktakkhor are not treated as units (older splits).
+        """
+        self.model_name = model_name
+        self.conjunct_aware = conjunct_aware
+        self.aggregation_strategy = aggregation_strategy
+        self.syllables_only = syllables_only
+        self._pipeline = None
+        self.pos_cache: PosTagCache | None = None
+        if pos_cache_path and not syllables_only:
+            self.pos_cache = PosTagCache(pos_cache_path, model_name)
+
+        if syllable_cache_size < 0:
+            raise ValueError("`syllable_cache_size` cannot be negative.")
+        self.syllable_cache_size = syllable_cache_size
+        self._split_cache = None
+        self._matra_cache = None
+        if syllable_cache_size:
+            # cached values are immutable (tuples / ints), callers get fresh lists
+            self._split_cache = lru_cache(maxsize=syllable_cache_size)(self._split_word_frozen)
+            self._matra_cache = lru_cache(maxsize=syllable_cache_size)(self._get_matra)
+
+    def cache_info(self) -> dict:
+        """functools `CacheInfo` of the syllable & matra caches (None if caching is off)"""
+        return {
+            "split_word_into_syllables": self._split_cache.cache_info() if self._split_cache else None,
+            "get_matra": self._matra_cache.cache_info() if self._matra_cache else None,
+        }
+
+    def cache_clear(self) -> None:
+        if self._split_cache:
+            self._split_cache.cache_clear()
+        if self._matra_cache:
+            self._matra_cache.cache_clear()
+
+    @property
+    def pipeline(self):
+        """the token-classification pipeline, loaded on first use"""
+        if self._pipeline is None:
+            self._pipeline = self.load_pos_pipeline()
+        return self._pipeline
+
+    def load_pos_pipeline(self):
+        if self.syllables_only:
+            raise RuntimeError("POS tagging is disabled for a `syllables_only` splitter")
+
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModelForTokenClassification.from_pretrained(model_name)
-            self.pipeline = pipeline(
+            from transformers import AutoTokenizer, AutoModelForTokenClassification, pipeline
+
+            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            self.model = AutoModelForTokenClassification.from_pretrained(self.model_name)
+            return pipeline(
                 "token-classification",
                 model=self.model,
                 tokenizer=self.tokenizer,
-                aggregation_strategy=aggregation_strategy
+                aggregation_strategy=self.aggregation_strategy
             )
         except Exception as e:
-            raise RuntimeError(f"Failed to load model/tokenizer '{model_name}': {e}") from e
+            raise RuntimeError(f"Failed to load model/tokenizer '{self.model_name}': {e}") from e
 
     def is_bangla_vowel(self, ch:str) -> bool:
         return ch in self.bangla_vowels_flattened
@@ -76,23 +163,7 @@ class SplitBanglaSyllables:
     def replace_vowel_symbols_with_letters(self, seq: str) -> str:
         """("অ", ""),
         ("আ", "া") conversion"""
-        # a mapping dictionary from symbol to letter
-        symbol_to_letter = {symbol: letter for letter, symbol in self.bangla_vowels if symbol}
-
-        if not seq:
-            return seq
-
-        # process char by char
-        result = ""
-        for char in seq:
-            # if character is a symbol, replace it with corresponding letter
-            if char in symbol_to_letter:
-                result += symbol_to_letter[char]
-            else:
-                # keep non-symbol characters as they are
-                result += char
-
-        return result
+        return seq.translate(self.symbol_to_letter_table)
 
     def is_swaranto(self, seq: str) -> bool: # মুক্তদল
         """check if the string ends with a vowel (স্বরান্ত)."""
@@ -108,6 +179,11 @@ class SplitBanglaSyllables:
 
     def get_matra(self, generated_syllables, chhondo) -> int:
         """calculate matra of a word"""
+        if self._matra_cache is not None:
+            return self._matra_cache(tuple(generated_syllables), chhondo)
+        return self._get_matra(generated_syllables, chhondo)
+
+    def _get_matra(self, generated_syllables, chhondo) -> int:
         sum = 0
         for index, syllable in enumerate(generated_syllables):
             if self.is_swaranto(syllable): # always মাত্রা 1 for মুক্তদল
@@ -124,18 +200,132 @@ class SplitBanglaSyllables:
                         sum += 1
         return sum
 
+    def syllable_type(self, syllable: str) -> int:
+        """VOWEL for মুক্তদল (স্বরান্ত), CONSONANT for রুদ্ধদল (ব্যঞ্জনান্ত), else OTHER"""
+        if not syllable:
+            return self.OTHER
+        last_char = syllable[-1]
+        if last_char == "\u09CD":  # hosonto (্)
+            return self.CONSONANT
+        return self.char_class.get(last_char, self.OTHER)
+
+    def get_all_matras(self, generated_syllables) -> dict[str, int]:
+        """matra of a word in all three chhondos, classifying each syllable once"""
+        swarabritta = matrabritta = aksharabritta = 0
+        last_index = len(generated_syllables) - 1
+        classify = self.char_class.get
+        for index, syllable in enumerate(generated_syllables):
+            if not syllable:
+                continue
+            kind = self.CONSONANT if syllable[-1] == "\u09CD" else classify(syllable[-1])
+            if kind == self.VOWEL: # always মাত্রা 1 for মুক্তদল
+                swarabritta += 1
+                matrabritta += 1
+                aksharabritta += 1
+            elif kind == self.CONSONANT:
+                swarabritta += 1
+                matrabritta += 2
+                aksharabritta += 2 if index == last_index else 1 # শব্দান্তে মাত্রা ২
+        return dict(zip(self.chhondos, (swarabritta, matrabritta, aksharabritta)))
+
+    def get_all_matras_batch(self, syllables_list):
+        """
+        matras of many words at once.
+
+        :param syllables_list: iterable of syllable lists, one per word
+        :return: numpy int array of shape (n_words, 3), columns in `chhondos` order
+        """
+        import numpy as np  # only needed for batch work, keeps plain imports light
+
+        lengths: list[int] = []
+        codes: list[int] = []
+        for generated_syllables in syllables_list:
+            lengths.append(len(generated_syllables))
+            codes.extend(self.syllable_type(syllable) for syllable in generated_syllables)
+
+        n_words = len(lengths)
+        if not codes:
+            return np.zeros((n_words, 3), dtype=np.int64)
+
+        lengths_arr = np.asarray(lengths, dtype=np.int64)
+        codes_arr = np.asarray(codes, dtype=np.int8)
+        word_index = np.repeat(np.arange(n_words), lengths_arr)
+        is_last = np.zeros(len(codes_arr), dtype=bool)
+        is_last[np.cumsum(lengths_arr)[lengths_arr > 0] - 1] = True
+
+        open_syllable = codes_arr == self.VOWEL
+        closed_syllable = codes_arr == self.CONSONANT
+        per_syllable = np.stack([
+            open_syllable | closed_syllable,
+            open_syllable + 2 * closed_syllable,
+            open_syllable + closed_syllable * (1 + is_last),
+        ], axis=1).astype(np.int64)
+
+        totals = np.zeros((n_words, 3), dtype=np.int64)
+        np.add.at(totals, word_index, per_syllable)
+        return totals
+
     def split_word_into_syllables(self, word: str) -> tuple[str, list[str]]:
+        if self._split_cache is not None:
+            initial_word, generated_syllables = self._split_cache(word)
+            return initial_word, list(generated_syllables)
+        return self._split_word_into_syllables(word)
+
+    def _split_word_frozen(self, word: str) -> tuple[str, tuple[str, ...]]:
+        initial_word, generated_syllables = self._split_word_into_syllables(word)
+        return initial_word, tuple(generated_syllables)
+
+    def _split_word_into_syllables(self, word: str) -> tuple[str, list[str]]:
+        initial_word, boundaries, closed, lettered = self.syllable_boundaries(word)
+        generated_syllables: list[str] = [initial_word[start:end] for start, end in zip(boundaries, boundaries[1:])]
+
+        index = 0
+        while lettered:
+            if lettered & 1:
+                generated_syllables[index] = generated_syllables[index].translate(self.symbol_to_letter_table)
+            lettered >>= 1
+            index += 1
+
+        index = 0
+        while closed:
+            if closed & 1:
+                generated_syllables[index] += "\u09CD"
+            closed >>= 1
+            index += 1
+
+        return initial_word, generated_syllables
+
+    def split_word_compact(self, word: str) -> "CompactSyllables":
+        """same split as split_word_into_syllables, kept as offsets into the word (see CompactSyllables)"""
+        initial_word, boundaries, closed, lettered = self.syllable_boundaries(word)
+        return CompactSyllables(initial_word, array("H", boundaries), closed, lettered)
+
+    def syllable_boundaries(self, word: str) -> tuple[str, list[int], int, int]:
         """
             * C-1: if ch[0] in bangla-vowels, then then split it and add in the syllables tuple
             * C-2: find the CCV CVC CV VC patterns using the arrays, properly check
             * no-need for now: C-3: conjunct split :- if C-1 & C-2 if not followed then only split the word
+
+            the syllables always are consecutive slices of the (stripped) word, so they are
+            returned as (word, boundaries, closed, lettered):
+                syllable i = word[boundaries[i]:boundaries[i+1]]
+                bit i of `closed` -> a hosonto is added at the end of syllable i
+                bit i of `lettered` -> vowel symbols of syllable i are written as letters ("া" -> "আ")
         """
         word = word.strip()
-        initial_word = word
-        generated_syllables: list[str] = []
+        boundaries: list[int] = [0]
+        closed = lettered = 0
 
         if not word:
-            return initial_word, generated_syllables
+            return word, boundaries, closed, lettered
+
+        if self.conjunct_aware and "\u09CD" in word and self.conjunct_table:
+            return self.conjunct_syllable_boundaries(word)
+
+        C, V = self.CONSONANT, self.VOWEL
+        classify = self.char_class.get
+        n = len(word)
+        offset = 0
 
         # Case 1:
         # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -143,75 +333,274 @@ class SplitBanglaSyllables:
             # if it starts with a consonanat then split & add hosonto
 
         # 1.1 | eg আকাশ: ['আ', 'কাশ্']
-        if len(word)!=1 and self.is_bangla_vowel(word[0]):
-            generated_syllables.append(word[0])
-            word = word[1:]
         # 1.1x | eg ী: ['ঈ']
-        elif len(word)==1 and self.is_bangla_vowel(word[0]):
-            generated_syllables.append(self.replace_vowel_symbols_with_letters(word[0]))
-            word = word[1:]
+        if classify(word[0]) == V:
+            if n == 1:
+                lettered |= 1
+            boundaries.append(1)
+            offset = 1
 
         # 1.2 | eg ক: ['ক্'] -> handled later
-        # elif len(word)==1 and is_bangla_consonant(word[0]):
-        #     generated_syllables.append(add_hosonto(word[0]))
-        #     word = word[1:]
-
-        # 1.3 | eg বিধাতার: ['বি', 'ধা', 'তা', 'র্']
-        # elif len(word)>=2 and is_bangla_consonant(word[0]) and is_bangla_vowel(word[1]):
-        #     generated_syllables.append(word[:2])
-        #     word = word[2:]
-
+        # 1.3 | eg বিধাতার: ['বি', 'ধা', 'তা', 'র্'] -> handled by case 2
 
 
         # Case 2: Split based on cvc, ccv, cv, vc patterns
         # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+            # single left-to-right scan over the `char_class` table, same
+            # leftmost-first semantics as re.finditer(cvc|ccv|cv|vc)
         is_matched:bool = False
+        start = last_end = offset
+
+        while start < n - 1:
+            first, second = classify(word[start], 0), classify(word[start + 1], 0)
+            third = classify(word[start + 2], 0) if start + 2 < n else 0
+
+            if first == C and second == V:
+                end = start + 3 if third == C else start + 2  # cvc | cv
+            elif first == C and second == C and third == V:
+                end = start + 3  # ccv
+            elif first == V and second == C:
+                end = start + 2  # vc
+            else:
+                start += 1
+                continue
 
-        c = f'[{"".join(self.bangla_consonants)}]'
-        v = f'[{"".join(self.bangla_vowels_flattened)}]'
-        pattern = f'{c}{v}{c}|{c}{{2}}{v}|{c}{v}|{v}{c}'  # cvc | ccv | cv | vc
-
-        matches = re.finditer(pattern, word)
-        last_end = 0
-
-        for match in matches:
-            start, end = match.span()
             if start > last_end:
                 # any unmatched portion __before__ the match
-                generated_syllables.append(self.add_hosonto(self.replace_vowel_symbols_with_letters(word[last_end:start])))
-            generated_syllables.append(self.add_hosonto(match.group())) # matched syllables pattern
-            last_end = end
+                bit = 1 << (len(boundaries) - 1)
+                lettered |= bit
+                if classify(word[start - 1]) == C:
+                    closed |= bit
+                boundaries.append(start)
+
+            # matched syllables pattern
+            if classify(word[end - 1]) == C:
+                closed |= 1 << (len(boundaries) - 1)
+            boundaries.append(end)
+            start = last_end = end
             is_matched = True
 
         # ~~~~~~~~ case for cc
-        if not is_matched and len(word)==2:
-            generated_syllables.append(self.add_hosonto(word))
-            last_end = 2
+        if not is_matched and n - offset == 2:
+            if classify(word[n - 1]) == C:
+                closed |= 1 << (len(boundaries) - 1)
+            boundaries.append(n)
+            last_end = n
 
         # c* [ccc...], !cc || case ~~~ 1.2 case also handled here
-        elif not is_matched and len(word)>0 and len(word)!=2:
-            generated_syllables.append(self.add_hosonto(word[0]))
-            word = word[1:]
-            # or
-            # last_end = 1
+        elif not is_matched and n - offset > 0:
+            if classify(word[offset]) == C:
+                closed |= 1 << (len(boundaries) - 1)
+            boundaries.append(offset + 1)
+            last_end = offset + 1
 
         # any remaining part of the word, __after__ match
-        if last_end < len(word):
-            generated_syllables.append(self.add_hosonto(self.replace_vowel_symbols_with_letters(word[last_end:])))
+        if last_end < n:
+            bit = 1 << (len(boundaries) - 1)
+            lettered |= bit
+            if classify(word[n - 1]) == C:
+                closed |= bit
+            boundaries.append(n)
 
-        return initial_word, generated_syllables
+        return word, boundaries, closed, lettered
+
+    def conjunct_units(self, word: str) -> tuple[list[int], list[int]]:
+        """
+        cuts a word into units for the splitter with one longest-match scan over `conjunct_table`:
+            conjunct at the start of the word -> one CONSONANT unit (eg ক্লা-ন্ত: ক্ল)
+            conjunct inside the word          -> CODA unit (first consonant + hosonto) that closes the
+                                                 syllable before it, then one CONSONANT unit for the rest
+                                                 (eg বিশ্ব: শ্ + ব, রবীন্দ্র: ন্ + দ্র)
+            anything else                     -> one unit per char
+        returns (unit start offsets with len(word) appended, unit classes)
+        """
+        C = self.CONSONANT
+        classify = self.char_class.get
+        table = self.conjunct_table
+        n = len(word)
+        starts: list[int] = []
+        classes: list[int] = []
+        i = 0
+
+        while i < n:
+            kind = classify(word[i], self.OTHER)
+            if kind == C and i + 2 < n and word[i + 1] == "\u09CD":
+                length = min(self.conjunct_max_length, n - i)
+                while length >= 3 and word[i:i + length] not in table:
+                    length -= 1
+                if length >= 3:
+                    if i:
+                        starts.append(i)
+                        classes.append(self.CODA)
+                        i += 2
+                        length -= 2
+                    starts.append(i)
+                    classes.append(C)
+                    i += length
+                    continue
+            starts.append(i)
+            classes.append(kind)
+            i += 1
+
+        starts.append(n)
+        return starts, classes
+
+    def conjunct_syllable_boundaries(self, word: str) -> tuple[str, list[int], int, int]:
+        """
+        syllable_boundaries over `conjunct_units` instead of single chars: same cases & the same
+        cvc|ccv|cv|vc scan, where a CODA unit can end a syllable (cvc, vc, ccv + CODA) but never starts one
+        """
+        C, V, CODA = self.CONSONANT, self.VOWEL, self.CODA
+        classify = self.char_class.get
+        starts, classes = self.conjunct_units(word)
+        units = len(classes)
+        kinds = classes + [self.OTHER] * 3  # padding for the look ahead
+        boundaries: list[int] = [0]
+        closed = lettered = 0
+        offset = 0
+
+        def close_if_consonant(end: int) -> None:
+            nonlocal closed
+            if classify(word[end - 1]) == C:
+                closed |= 1 << (len(boundaries) - 1)
+
+        def attach_to_previous(first: int, end: int) -> bool:
+            """
+            units first..end left over between two matches right at a conjunct (starting with a CODA, or
+            only the rest of a conjunct whose CODA closed the syllable before) are no syllable of their own,
+            they extend the previous one (শ্রাব + স্ -> শ্রাবস্, অগ্ + র -> অগ্র্); False if they are not such a leftover
+            """
+            nonlocal closed
+            at_conjunct = kinds[first] == CODA or (end - first == 1 and first and kinds[first - 1] == CODA)
+            if len(boundaries) < 2 or not at_conjunct:
+                return False
+            boundaries[-1] = starts[end]
+            bit = 1 << (len(boundaries) - 2)
+            closed = (closed | bit) if classify(word[starts[end] - 1]) == C else (closed & ~bit)
+            return True
+
+        # Case 1: word starts with a vowel, split it off (unless a conjunct closes it, eg অন্-ধ)
+        if kinds[0] == V and kinds[1] != CODA:
+            if units == 1:
+                lettered |= 1
+            boundaries.append(starts[1])
+            offset = 1
+
+        # Case 2: cvc | ccv | cv | vc over units
+        is_matched:bool = False
+        start = last_end = offset
+
+        while start < units - 1:
+            first, second, third = kinds[start], kinds[start + 1], kinds[start + 2]
+
+            if first == C and second == V:
+                end = start + 3 if third in (C, CODA) else start + 2  # cvc | cv
+            elif first == C and second == C and third == V:
+                end = start + 4 if kinds[start + 3] == CODA else start + 3  # ccv (+ closing conjunct)
+            elif first == V and second in (C, CODA):
+                end = start + 2  # vc
+            else:
+                start += 1
+                continue
+
+            if start > last_end and not attach_to_previous(last_end, start):
+                # any unmatched portion __before__ the match
+                lettered |= 1 << (len(boundaries) - 1)
+                close_if_consonant(starts[start])
+                boundaries.append(starts[start])
+
+            close_if_consonant(starts[end])
+            boundaries.append(starts[end])
+            start = last_end = end
+            is_matched = True
+
+        # ~~~~~~~~ case for cc
+        if not is_matched and units - offset == 2:
+            close_if_consonant(starts[units])
+            boundaries.append(starts[units])
+            last_end = units
+
+        # c* [ccc...], !cc
+        elif not is_matched and units - offset > 0:
+            close_if_consonant(starts[offset + 1])
+            boundaries.append(starts[offset + 1])
+            last_end = offset + 1
+
+        # any remaining part of the word, __after__ match
+        if last_end < units:
+            lettered |= 1 << (len(boundaries) - 1)
+            close_if_consonant(starts[units])
+            boundaries.append(starts[units])
+
+        return word, boundaries, closed, lettered
 
     def split_sentence_into_syllables(self, sentence: str) -> list[tuple[str, list[str]]]:
-        sentence = sentence.strip()
+        sentence = normalize_text(sentence.strip())
         if not sentence:
             return []
 
-        sentence = re.sub(r'[,.।;:]', '', sentence) # remove puntuations and spaces
+        sentence = self.punctuation_pattern.sub('', sentence) # remove puntuations and spaces
         words:list = [word for word in sentence.split() if word]
         generated_syllables:list = [self.split_word_into_syllables(word) for word in words]
 
         return generated_syllables
 
+    def iter_words(self, source, chunk_size: int = 1 << 16):
+        """
+        Lazily yields the words of `source` (normalized & punctuations removed, same
+        as split_sentence_into_syllables), without reading all of it into memory.
+
+        :param source: path of a utf-8 text file, a text file object, or an iterable of lines
+        :param chunk_size: characters read at a time from a file
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "r", encoding="utf-8") as f:
+                yield from self.iter_words(f, chunk_size)
+            return
+
+        if not hasattr(source, "read"):
+            # iterable of lines, a line never ends in the middle of a word
+            for line in source:
+                yield from self.punctuation_pattern.sub('', normalize_text(line)).split()
+            return
+
+        # file object, read fixed size chunks & carry over a word cut at the chunk end
+        carry = ""
+        while chunk := source.read(chunk_size):
+            # a combining mark cut off from its letter is re-joined through `carry`
+            text = self.punctuation_pattern.sub('', normalize_text(carry + chunk))
+            words = text.split()
+            carry = words.pop() if words and not text[-1].isspace() else ""
+            yield from words
+        if carry:
+            yield carry
+
+    def iter_syllables(self, source, chunk_size: int = 1 << 16):
+        """
+        Streaming version of split_sentence_into_syllables, yields (word, syllables)
+        one word at a time, in constant memory. `source` is as in `iter_words`.
+        """
+        for word in self.iter_words(source, chunk_size):
+            yield self.split_word_into_syllables(word)
+
+    def check_pos_input(self, word: str) -> None:
+        """raises ValueError if `word` can not be sent for POS tagging"""
+        if not isinstance(word, str):
+            raise ValueError("`word` must be a string.")
+        if not word.strip():
+            raise ValueError("`word` cannot be empty or whitespace.")
+
+    def pick_pos_tag(self, word: str, results) -> str:
+        """pick the POS tag from the pipeline output of a single word"""
+        if not results:
+            raise RuntimeError(f"No POS tags returned for input '{word}'")
+
+        tag = results[0].get("entity_group") or results[0].get("entity")
+        if not tag:
+            raise RuntimeError(f"Unable to determine POS tag for input '{word}'")
+
+        return tag
+
     def get_parts_of_speech(self, word: str) -> str:
         """
         Returns the POS tag for the given Bengali word.
@@ -221,32 +610,135 @@ class SplitBanglaSyllables:
         :raises ValueError: if input is invalid
         :raises RuntimeError: for pipeline failures or no tag found
         """
-        if not isinstance(word, str):
-            raise ValueError("`word` must be a string.")
-        if not word.strip():
-            raise ValueError("`word` cannot be empty or whitespace.")
+        self.check_pos_input(word)
+        if self.pos_cache is not None:
+            tag = self.pos_cache.get(word)
+            if tag:
+                return tag
+
+        pos_pipeline = self.pipeline
+        from transformers.pipelines import PipelineException
 
         try:
-            results = self.pipeline(word)
+            results = pos_pipeline(word)
         except PipelineException as pe:
             raise RuntimeError(f"Pipeline processing error for input '{word}': {pe}") from pe
         except Exception as e:
             raise RuntimeError(f"Unexpected error during POS tagging: {e}") from e
 
-        if not results:
-            raise RuntimeError(f"No POS tags returned for input '{word}'")
+        tag = self.pick_pos_tag(word, results)
+        if self.pos_cache is not None:
+            self.pos_cache.put(word, tag)
+        return tag
 
-        tag = results[0].get("entity_group") or results[0].get("entity")
-        if not tag:
-            raise RuntimeError(f"Unable to determine POS tag for input '{word}'")
+    def get_parts_of_speech_batch(self, words: list[str], batch_size: int = 64) -> list[str]:
+        """
+        Returns the POS tags for many Bengali words, in the same order as `words`.
+        Words are sent through the pipeline `batch_size` at a time (padded batches),
+        instead of one forward pass per word. With a POS cache, only the unique
+        words missing from the cache are sent.
+
+        :param words: list of single Bengali words or short phrases
+        :param batch_size: number of words per forward pass
+        :return: list of pos_tags, one per input word
+        :raises ValueError: if any input is invalid, or batch_size < 1
+        :raises RuntimeError: for pipeline failures or no tag found for some word
+        """
+        if batch_size < 1:
+            raise ValueError("`batch_size` must be at least 1.")
 
-        return tag
+        words = list(words)
+        for word in words:
+            self.check_pos_input(word)
+
+        if not words:
+            return []
+
+        if self.pos_cache is None:
+            return self.infer_parts_of_speech(words, batch_size)
+
+        tags = self.pos_cache.get_many(words)
+        missing = [word for word in dict.fromkeys(words) if word not in tags]
+        if missing:
+            inferred = dict(zip(missing, self.infer_parts_of_speech(missing, batch_size)))
+            self.pos_cache.put_many(inferred.items())
+            tags.update(inferred)
+
+        return [tags[word] for word in words]
+
+    def infer_parts_of_speech(self, words: list[str], batch_size: int) -> list[str]:
+        """run the (already validated) words through the model, no cache"""
+        pos_pipeline = self.pipeline
+        from transformers.pipelines import PipelineException
+
+        try:
+            results = pos_pipeline(words, batch_size=batch_size)
+        except PipelineException as pe:
+            raise RuntimeError(f"Pipeline processing error for batch input: {pe}") from pe
+        except Exception as e:
+            raise RuntimeError(f"Unexpected error during POS tagging: {e}") from e
+
+        return [self.pick_pos_tag(word, result) for word, result in zip(words, results)]
 
     def __repr__(self):
         return "<SplitBanglaSyllables> Split Bangla words & sentences into syllables"
 
 
 
+class CompactSyllables:
+    """
+    Memory-light form of a split word: the word itself, the syllable boundaries as
+    an array('H') of offsets into it, and per-syllable flag bitmasks (bit i = syllable i)
+        closed   -> a hosonto is added at the end (রুদ্ধদল)
+        lettered -> vowel symbols are written as letters ("া" -> "আ")
+    syllable strings are only built when asked for.
+    """
+    __slots__ = ("word", "offsets", "closed", "lettered")
+
+    def __init__(self, word: str, offsets: array, closed: int = 0, lettered: int = 0):
+        self.word = word
+        self.offsets = offsets
+        self.closed = closed
+        self.lettered = lettered
+
+    def __len__(self) -> int:
+        return max(len(self.offsets) - 1, 0)
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("syllable index out of range")
+
+        syllable = self.word[self.offsets[index]:self.offsets[index + 1]]
+        if self.lettered >> index & 1:
+            syllable = syllable.translate(SplitBanglaSyllables.symbol_to_letter_table)
+        if self.closed >> index & 1:
+            syllable += "\u09CD"
+        return syllable
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactSyllables):
+            return NotImplemented
+        return (self.word, self.offsets, self.closed, self.lettered) == (other.word, other.offsets, other.closed, other.lettered)
+
+    def is_closed(self, index: int) -> bool:
+        return bool(self.closed >> index & 1)
+
+    def syllables(self) -> list[str]:
+        return list(self)
+
+    def to_tuple(self) -> tuple[str, list[str]]:
+        """same shape as split_word_into_syllables"""
+        return self.word, list(self)
+
+    def __repr__(self):
+        return f"<CompactSyllables> {self.word}: {list(self)}"
+
+
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # Test
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -270,6 +762,8 @@ if __name__ == "__main__":
         "বিদ্যালয়",
         "বিশ্ববিদ্যালয়",
         "রবীন্দ্রনাথ",
+        # conjunct right after a closed syllable, no stray স্ / র্ syllable
+        "শ্রাবস্তীর", "অগ্রগতি",
         "বিধাতার",
         "আনারস",
 
@@ -298,7 +792,7 @@ if __name__ == "__main__":
                 সব পাখি ঘরে আসে—সব নদী—ফুরায় এ-জীবনের সব লেনদেন;
                 থাকে শুধু অন্ধকার, মুখোমুখি বসিবার বনলতা সেন।"""
 
-    splitter:SplitBanglaSyllables = SplitBanglaSyllables()
+    splitter:SplitBanglaSyllables = SplitBanglaSyllables(syllables_only=True)
 
     file = "word_to_syllables/output.txt"
 
@@ -327,7 +821,7 @@ if __name__ == "__main__":
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # issues:
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# juktakhor handling - not so proper, sometimes they themselves split & sometimes they stick together, can be optimised
+# juktakhor handling - conjuncts from conjuncts.txt are units now (longest match), but the inherent vowel after a consonant is still not modelled (eg ক্ষমা: [ক্ষমা])
 # chandrabindu, un-sar --
 
 